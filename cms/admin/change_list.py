@@ -1,11 +1,13 @@
 from django.contrib.admin.views.main import ChangeList, ALL_VAR, IS_POPUP_VAR,\
     ORDER_TYPE_VAR, ORDER_VAR, SEARCH_VAR
-from cms.models import Title, PagePermission, Page
+from cms.models import PagePermission, Page
 from cms import settings
-from cms.utils import get_language_from_request, find_children
+from cms.utils import get_language_from_request, find_children, index_children
 from django.contrib.sites.models import Site
 from cms.utils.permissions import get_user_sites_queryset
 from cms.exceptions import NoHomeFound
+from cms.cache.home import get_home_pk
+from cms.models.query import attach_titles
 
 SITE_VAR = "site__exact"
 COPY_VAR = "copy"
@@ -85,14 +87,14 @@ class CMSChangeList(ChangeList):
             # TODO: add some filtering here, so the set is the same like page set...
             published_public_page_id_set = Page.objects.public().filter(published=True).values_list('id', flat=True)
         
-        ids = []
         root_pages = []
         pages = list(pages)
         all_pages = pages[:]
         try:
-            home_pk = Page.objects.drafts().get_home(self.current_site()).pk
+            home_pk = get_home_pk(self.current_site().pk, True)
         except NoHomeFound:
             home_pk = 0
+        children_index = index_children(pages)
             
         for page in pages:
             children = []
@@ -105,7 +107,6 @@ class CMSChangeList(ChangeList):
                 page.root_node = True
             else:
                 page.root_node = False
-            ids.append(page.pk)
             
             if settings.CMS_PERMISSION:
                 # caching the permissions
@@ -131,18 +132,10 @@ class CMSChangeList(ChangeList):
                     page.ancestors_ascending = []
                 page.home_pk_cache = home_pk
                 if not self.is_filtered():
-                    find_children(page, pages, 1000, 1000, [], -1, soft_roots=False, request=request, no_extended=True, to_levels=1000)
+                    find_children(page, pages, 1000, 1000, [], -1, soft_roots=False, request=request, no_extended=True, to_levels=1000, children_index=children_index)
                 else:
                     page.childrens = []
-        titles = Title.objects.filter(page__in=ids)
-        for page in all_pages:# add the title and slugs and some meta data
-            page.languages_cache = []
-            for title in titles:
-                if title.page_id == page.pk:
-                    if title.language == lang:
-                        page.title_cache = title
-                    if not title.language in page.languages_cache:
-                        page.languages_cache.append(title.language)
+        attach_titles(all_pages, lang)
         
         self.root_pages = root_pages
         
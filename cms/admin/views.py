@@ -11,6 +11,7 @@ from cms.plugin_pool import plugin_pool
 from django.template.defaultfilters import escapejs, force_escape
 from django.views.decorators.http import require_POST
 from cms.utils.admin import render_admin_menu_item
+from cms.utils.plugins import downcast_plugins
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 
 @require_POST
@@ -237,7 +238,9 @@ def save_all_plugins(request, page, excludes=None):
     if not page.has_change_permission(request):
         raise Http404
     
-    for plugin in CMSPlugin.objects.filter(page=page):
+    plugins = list(CMSPlugin.objects.filter(page=page))
+    downcast_plugins(plugins)
+    for plugin in plugins:
         if excludes:
             if plugin.pk in excludes:
                 continue
@@ -1,8 +1,12 @@
 from django.conf import settings
 from cms.settings import CMS_FLAT_URLS
 from django.core.urlresolvers import RegexURLResolver, Resolver404, reverse
-from cms.utils.moderator import get_page_queryset
-from cms.models import Page
+from cms.utils.moderator import get_page_queryset, use_draft
+from cms.models import Title
+from cms.cache.generation import get_generation, bump_generation
+from cms.utils.urlutils import levelize_path
+
+GENERATION = "applications"
 
 
 def applications_page_check(request, current_page=None, path=None):
@@ -14,16 +18,13 @@ def applications_page_check(request, current_page=None, path=None):
     if path is None:
         path = request.path.replace(reverse('pages-root'), '', 1)
     # check if application resolver can resolve this
-    try:
-        page_id = dynamic_app_regex_url_resolver.resolve_page_id(path+"/")
-        # yes, it is application page
-        page = get_page_queryset(request).get(id=page_id)
-        # If current page was matched, then we have some override for content
-        # from cms, but keep current page. Otherwise return page to which was application assigned.
-        return page 
-    except Resolver404:
-        pass
-    return None    
+    page_id = dynamic_app_regex_url_resolver.find_page_id(path+"/")
+    if page_id is None:
+        return None
+    # yes, it is application page
+    # If current page was matched, then we have some override for content
+    # from cms, but keep current page. Otherwise return page to which was application assigned.
+    return get_page_queryset(request).get(id=page_id)
 
 class PageRegexURLResolver(RegexURLResolver):
     page_id = None
@@ -74,6 +75,34 @@ class DynamicAppRegexURLResolver(PageRegexURLResolver):
     def urlconf_module(self): 
         return self._dynamic_url_conf_module
     
+    def find_page_id(self, path):
+        """Returns id of page owning given path, or None if there isn't any.
+        
+        Instead of trying all the application resolvers one by one, the owner
+        is looked up in dispatch table by the longest hooked path prefix, and
+        only the application hooked there gets asked if it handles the path.
+        Paths without any hooked prefix don't touch any resolver.
+        """
+        dispatch_table = self.urlconf_module.dispatch_table
+        resolvers = ()
+        for prefix in levelize_path(path):
+            if prefix in dispatch_table:
+                resolvers = dispatch_table[prefix]
+                break
+        for resolver in resolvers:
+            try:
+                resolver.resolve(path)
+            except Resolver404:
+                continue
+            return resolver.page_id
+        return None
+    
+    def resolve_page_id(self, path):
+        page_id = self.find_page_id(path)
+        if page_id is None:
+            raise Resolver404, {'path': path}
+        return page_id
+    
     def reset_cache(self):
         self._dynamic_url_conf_module.reset_cache()
     
@@ -94,9 +123,10 @@ class ApplicationRegexUrlResolver(PageRegexURLResolver):
         # If it will work, will be give us possibility to configure one
         # application for multiple hooks. 
         if CMS_FLAT_URLS:
-            regex = r'^%s' % title.slug
+            self.path = title.slug
         else:
-            regex = r'^%s' % title.path
+            self.path = title.path
+        regex = r'^%s' % self.path
         if settings.APPEND_SLASH:
             regex += r'/'  
         urlconf_name = title.application_urls
@@ -113,56 +143,85 @@ class DynamicURLConfModule(object):
     Currently only urlpatterns are accessed from url_conf module, so this 
     provides urlpatterns property.
     
+    Patterns are cached per site and versioned by the applications generation
+    (see cms.cache.generation), so changes made in one process get picked up 
+    lazily by all of them. Together with patterns there is a dispatch table 
+    mapping hooked paths to their resolvers, used for finding page owning 
+    some path.
+    
     IMPORTANT!: If will be RegexURLResolver changed from django team, this may 
     lead to problems and have to be fixed.
     """
     def __init__(self):
-        self._urlpatterns = None
+        # {site_id: (generation, urlpatterns, dispatch_table)}
+        self._urlpatterns = {}
+    
+    def _get_cached(self):
+        """Caches result, so db lookup is required only once per site, or 
+        when the generation gets bumped.
+        """
+        site_id = settings.SITE_ID
+        generation = get_generation(GENERATION)
+        cached = self._urlpatterns.get(site_id, None)
+        if cached is None or cached[0] != generation:
+            urlpatterns = self.build_urlpatterns(site_id)
+            cached = (generation, urlpatterns, self.build_dispatch_table(urlpatterns))
+            self._urlpatterns[site_id] = cached
+        return cached
     
     @property
     def urlpatterns(self):
         """Create urlresolvers for hookable applications on the fly.
-        
-        Caches result, so db lookup is required only once, or when the cache
-        is reseted.
         """
-        if not self._urlpatterns:
-            # TODO: will this work with multiple sites? how are they exactly
-            # implemented ?
-            # probably will be better to make caching per site
-            
-            self._urlpatterns, included = [], []
-            
-            # we don't have a request here so get_page_queryset() can't be used,
-            # so, if CMS_MODERATOR, use, public() queryset, otherwise 
-            # use draft(). This can be done, because url patterns are used just 
-            # in frontend
-            if getattr(settings, "CMS_MODERATOR", False):
-                pages = Page.objects.public()
+        return self._get_cached()[1]
+    
+    @property
+    def dispatch_table(self):
+        """Hooked paths mapped to list of their resolvers.
+        """
+        return self._get_cached()[2]
+    
+    def build_urlpatterns(self, site_id):
+        """Builds resolvers for all application hooks on given site with a 
+        single query.
+        """
+        urlpatterns, included = [], []
+        
+        # we don't have a request here so get_title_queryset() can't be used,
+        # so, if CMS_MODERATOR, use public titles, otherwise drafts. This can 
+        # be done, because url patterns are used just in frontend
+        titles = Title.objects.filter(
+            page__site=site_id,
+            publisher_is_draft=use_draft(),
+            application_urls__gt="",
+        ).order_by('page__tree_id', 'page__lft')
+        
+        for title in titles:
+            if CMS_FLAT_URLS:
+                mixid = "%s:%s" % (title.slug + "/", title.application_urls)
             else:
-                pages = Page.objects.drafts()
-            
-            for page in pages:
-                # get all titles with application
-                title_set = page.title_set.filter(application_urls__gt="")
-                for title in title_set:
-                    if CMS_FLAT_URLS:
-                        mixid = "%s:%s" % (title.slug + "/", title.application_urls)
-                    else:
-                        mixid = "%s:%s" % (title.path + "/", title.application_urls)
-                    if mixid in included:
-                        # don't add the same thing twice
-                        continue  
-                    self._urlpatterns.append(ApplicationRegexUrlResolver(title))
-                    included.append(mixid)
-        return self._urlpatterns
+                mixid = "%s:%s" % (title.path + "/", title.application_urls)
+            if mixid in included:
+                # don't add the same thing twice
+                continue  
+            urlpatterns.append(ApplicationRegexUrlResolver(title))
+            included.append(mixid)
+        return urlpatterns
+    
+    def build_dispatch_table(self, urlpatterns):
+        """Maps path of each application resolver to list of resolvers 
+        hooked on it, in the same order as they are in urlpatterns.
+        """
+        dispatch_table = {}
+        for resolver in urlpatterns:
+            dispatch_table.setdefault(resolver.path, []).append(resolver)
+        return dispatch_table
         
     def reset_cache(self):
         """Reset urlpatterns cache. Should be called always when there is some
-        application change on any page
+        application change on any page. Patterns get rebuilt on next access, 
+        in every process.
         """
-        self._urlpatterns = None
-        # recache patterns with new state
-        fake = self.urlpatterns
+        bump_generation(GENERATION)
 
 dynamic_app_regex_url_resolver = DynamicAppRegexURLResolver()
\ No newline at end of file
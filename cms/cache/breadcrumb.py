@@ -0,0 +1,76 @@
+"""Per page and language cache of breadcrumb trails.
+
+Trail of a page are its ancestors and the page itself, with home page at the
+beginning if it isn't the root of the page's tree. It is loaded together with
+all the titles in single query using nested set bounds, and kept until some
+page or title changes (navigation and home generations, see
+cms.cache.signals). Only MAX_TRAILS most recently used trails are kept.
+"""
+import copy
+from django.db.models import Q
+from cms import settings
+from cms.exceptions import NoHomeFound
+from cms.cache.generation import get_generation
+from cms.cache import navigation, home
+from cms.cache.lru import LRUDict
+
+MAX_TRAILS = 1000
+
+# {draft: (generations, LRUDict({(page_id, language): [Page, ...]}))}
+_trails = {}
+
+
+def build_breadcrumb(page, language, draft):
+    """Loads trail of given page with single query, pages get their titles
+    in language (latest one if they aren't translated), ancestors and urls.
+    """
+    from cms.models import Title
+    try:
+        home_pk = home.get_home_pk(settings.SITE_ID, draft)
+    except NoHomeFound:
+        home_pk = 0
+    q = Q(page__tree_id=page.tree_id, page__lft__lte=page.lft, page__rght__gte=page.rght)
+    titles = Title.objects.filter(q | Q(page__pk=home_pk)).select_related('page')
+    pages, page_titles = {}, {}
+    for title in titles.order_by('creation_date'):
+        pages.setdefault(title.page_id, title.page)
+        page_titles.setdefault(title.page_id, []).append(title)
+    trail = [p for p in pages.values() if p.tree_id == page.tree_id]
+    trail.sort(key=lambda p: p.lft)
+    if home_pk in pages and (not trail or trail[0].pk != home_pk):
+        trail.insert(0, pages[home_pk])
+    ancestors = []
+    for p in trail:
+        titles = page_titles[p.pk]
+        p.languages_cache = []
+        p.title_cache = titles[-1]
+        for title in titles:
+            if not title.language in p.languages_cache:
+                p.languages_cache.append(title.language)
+            if title.language == language:
+                p.title_cache = title
+        p.home_pk_cache = home_pk
+        p.ancestors_ascending = [a for a in ancestors if a.tree_id == p.tree_id]
+        p.absolute_url_cache = p.get_absolute_url()
+        ancestors.append(p)
+    return trail
+
+def get_breadcrumb(page, language, draft=None):
+    """Returns trail of given page, the last item is the page itself. Items
+    are copies, so they can be changed. Draft must be given for pages which
+    aren't Page instances (navigation nodes).
+    """
+    generations = (get_generation(navigation.GENERATION), get_generation(home.GENERATION))
+    if draft is None:
+        draft = page.publisher_is_draft
+    draft = bool(draft)
+    cached = _trails.get(draft, None)
+    if cached is None or cached[0] != generations:
+        cached = (generations, LRUDict(MAX_TRAILS))
+        _trails[draft] = cached
+    key = (page.pk, language)
+    trail = cached[1].get(key, None)
+    if trail is None:
+        trail = build_breadcrumb(page, language, draft)
+        cached[1][key] = trail
+    return [copy.copy(p) for p in trail]
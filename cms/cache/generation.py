@@ -0,0 +1,44 @@
+"""Generation counters shared over the django cache backend.
+
+Process local structures (routing index, application resolvers, ...) remember
+the generation they were built with and rebuild themselves lazily when some
+other process bumps it, so all the workers pick up changes without talking to
+each other.
+"""
+import time
+from django.core.cache import cache
+
+# generation values are tiny, keep them as long as the backend allows
+TTL = 60 * 60 * 24 * 30
+
+get_generation_key = lambda name: "CMS::Generation::%s" % name
+
+def _initial_generation():
+    # start from current time, so nothing stored under some expired
+    # generation can come back to life
+    return int(time.time() * 1000)
+
+def get_generation(name):
+    """Returns current generation for given name.
+    """
+    key = get_generation_key(name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _initial_generation(), TTL)
+        generation = cache.get(key)
+        if generation is None:
+            # dummy cache backend, nothing can be shared
+            generation = _initial_generation()
+    return generation
+
+def bump_generation(*names):
+    """Invalidates everything built with current generation of given names.
+    
+    New generation is at least current time in milliseconds, so it tells also
+    when the last change happened. Concurrent bumps may end with the same 
+    value, but each of them differs from the generation they replaced, which
+    is all what matters here.
+    """
+    for name in names:
+        generation = max(get_generation(name) + 1, _initial_generation())
+        cache.set(get_generation_key(name), generation, TTL)
@@ -0,0 +1,56 @@
+"""Process wide registry of home pages.
+
+Home page is the first published root page on the site. It is required for
+almost every page url, so it is kept in memory for each (site, draft/public)
+combination, and found again lazily when the home generation gets bumped from
+page signals (see cms.cache.signals).
+"""
+import copy
+from cms.exceptions import NoHomeFound
+from cms.cache.generation import get_generation, bump_generation
+
+GENERATION = "home"
+
+# {(site_id, draft): (generation, page)}, page is None if there isn't any home
+_homes = {}
+
+
+def find_home(site_id, draft):
+    """Looks up home page in db, returns None if there isn't any.
+    """
+    from cms.models import Page
+    pages = Page.objects.get_query_set().filter(publisher_is_draft=draft)
+    try:
+        return pages.published(site_id).all_root().order_by("tree_id")[0]
+    except IndexError:
+        return None
+
+def _get_home(site_id, draft):
+    generation = get_generation(GENERATION)
+    key = (site_id, bool(draft))
+    cached = _homes.get(key, None)
+    if cached is None or cached[0] != generation:
+        cached = (generation, find_home(site_id, draft))
+        _homes[key] = cached
+    if cached[1] is None:
+        raise NoHomeFound('No Root page found. Publish at least on page!')
+    return cached[1]
+
+def get_home(site_id, draft):
+    """Returns home page for given site and publisher state, raises NoHomeFound
+    if there isn't any. 
+    
+    Returned instance is a copy, so attributes assigned to it during request
+    (title cache, menu attributes, ...) don't leak to other requests.
+    """
+    return copy.copy(_get_home(site_id, draft))
+
+def get_home_pk(site_id, draft):
+    """Returns pk of home page, raises NoHomeFound if there isn't any.
+    """
+    return _get_home(site_id, draft).pk
+
+def clear_home_cache():
+    """Invalidates home pages in all processes.
+    """
+    bump_generation(GENERATION)
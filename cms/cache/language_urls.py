@@ -0,0 +1,72 @@
+"""Per page map of language to absolute url.
+
+Language choosers, fallback redirects and alternate links need url of the same
+page in every language. Map for a page is built with single title query and
+kept until titles, page tree or home page change (routing and home
+generations, see cms.cache.signals). Only MAX_PAGES most recently used maps
+are kept.
+"""
+import copy
+from cms import settings
+from cms.cache.generation import get_generation
+from cms.cache import routing, home
+from cms.cache.lru import LRUDict
+
+MAX_PAGES = 1000
+
+# {draft: (generations, LRUDict({page_id: {language: (url, translated)}}))}
+_maps = {}
+
+
+def build_language_urls(page):
+    """Returns {language: (url, translated)} for all the LANGUAGES page is
+    available in, untranslated languages point to url of fallback title,
+    like page.get_absolute_url(language, fallback=True) does.
+    """
+    from cms.models import Title
+    titles = list(Title.objects.filter(page=page).order_by('creation_date'))
+    if not titles:
+        return {}
+    if page.parent_id:
+        # fill ancestors, so copies share them
+        page.get_cached_ancestors()
+    urls = {}
+    for title in titles:
+        # don't touch title cache of given instance
+        page_copy = copy.copy(page)
+        page_copy.title_cache = title
+        urls[title.language] = page_copy.get_absolute_url(language=title.language, fallback=False)
+    # latest title is used as fallback
+    fallback_url = urls[titles[-1].language]
+    language_urls = {}
+    for language, name in settings.LANGUAGES:
+        if language in urls:
+            language_urls[language] = (urls[language], True)
+        else:
+            language_urls[language] = (fallback_url, False)
+    return language_urls
+
+def get_language_urls(page):
+    """Returns {language: (url, translated)} map for given page, builds it if
+    required.
+    """
+    generations = (get_generation(routing.GENERATION), get_generation(home.GENERATION))
+    draft = page.publisher_is_draft
+    cached = _maps.get(draft, None)
+    if cached is None or cached[0] != generations:
+        cached = (generations, LRUDict(MAX_PAGES))
+        _maps[draft] = cached
+    urls = cached[1].get(page.pk, None)
+    if urls is None:
+        urls = build_language_urls(page)
+        cached[1][page.pk] = urls
+    return urls
+
+def get_language_url(page, language, fallback=True):
+    """Absolute url of page in given language, None if page isn't translated
+    to it and fallback isn't allowed.
+    """
+    url, translated = get_language_urls(page).get(language, (None, False))
+    if translated or fallback:
+        return url
+    return None
@@ -0,0 +1,49 @@
+"""Size bounded dict for process local caches keyed on pages.
+
+Caches which fill lazily with an entry for each visited page would hold the
+whole site in every process, so they drop entries which weren't used for the
+longest time once they reach their size.
+"""
+
+
+class LRUDict(object):
+    def __init__(self, max_size):
+        self.max_size = max_size
+        # {key: (tick of last use, value)}
+        self._items = {}
+        self._tick = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def _touch(self, key, value):
+        self._tick += 1
+        self._items[key] = (self._tick, value)
+
+    def __getitem__(self, key):
+        value = self._items[key][1]
+        self._touch(key, value)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            # missing, or evicted by other thread meanwhile
+            return default
+
+    def __setitem__(self, key, value):
+        if not key in self._items and len(self._items) >= self.max_size:
+            self._evict()
+        self._touch(key, value)
+
+    def _evict(self):
+        # drop the least recently used quarter at once, so the sort doesn't
+        # run on every insert
+        by_use = sorted(self._items.items(), key=lambda item: item[1][0])
+        for key, item in by_use[:max(1, self.max_size // 4)]:
+            # other thread may be evicting too
+            self._items.pop(key, None)
@@ -0,0 +1,115 @@
+"""Rendered html of menu tags, enabled by CMS_MENU_CACHE.
+
+Fragments are keyed on the navigation generation, language, tag arguments and
+the pages which decide how the menu looks for the current page, so they are
+shared by all the requests which render the same branch, and get invalidated
+by structural changes only (see cms.cache.signals), not after some time.
+
+Menus rendering levels of the tree (show_menu) depend just on the menu root
+and on the part of the path to the current page which lies in the rendered
+levels, so e.g. all the pages below the last rendered level share one
+fragment. Menus built from the current page itself (sub menu, breadcrumb)
+are keyed on the whole path.
+"""
+import time
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.hashcompat import md5_constructor
+from django.utils.safestring import mark_safe
+from cms import settings
+from cms.utils.cmscontext import get_cms_context
+from cms.extender_pool import extender_pool, get_generation_name
+from cms.cache.generation import get_generation, TTL
+from cms.cache import navigation
+
+
+def get_menu_branch(tree, page, ancestors, to_level, root_id=None):
+    """Returns (root id, ids of rendered ancestors, id of given page if it's
+    rendered) for show_menu. Menu root is picked the same way as show_menu
+    does - page with root_id, or the deepest soft root on the path. None if
+    the menu root isn't in the tree.
+    """
+    root = None
+    if root_id:
+        root = tree.get_page_by_reverse_id(root_id)
+        if root is None:
+            return None
+    else:
+        for node in ancestors + [page]:
+            if node.soft_root:
+                root = node
+    if root is None:
+        is_rendered = lambda node: node.level <= to_level
+    else:
+        max_level = root.level + to_level
+        is_rendered = lambda node: (node.tree_id == root.tree_id and root.lft <= node.lft
+            and node.rght <= root.rght and node.level <= max_level)
+    # selected page renders differently than its ancestors
+    return (getattr(root, 'pk', None), [node.pk for node in ancestors if is_rendered(node)],
+        is_rendered(page) and page.pk or None)
+
+def get_menu_cache_key(request, name, args, levels=None):
+    """Cache key for menu tag with given name and arguments rendered for the
+    current page, None if the menu can't be cached. Menus which render levels
+    of the tree give (to_level, root_id) as levels, see get_menu_branch.
+    """
+    page = request.current_page
+    if not settings.CMS_MENU_CACHE or not page:
+        # pages handled by extenders are selected by request path
+        return None
+    cms_context = get_cms_context(request)
+    tree = navigation.get_navigation_tree(cms_context.site.pk, cms_context.language, cms_context.draft)
+    generations = [get_generation(navigation.GENERATION)]
+    for path in tree.extenders:
+        if not getattr(extender_pool.get_extender(path), 'cache_timeout', None):
+            # nodes may change at any time
+            return None
+        generations.append(get_generation(get_generation_name(path)))
+    if settings.CMS_SHOW_START_DATE or settings.CMS_SHOW_END_DATE:
+        # trees get reloaded after this time, so should the menus
+        generations.append(int(time.time() // settings.CMS_CONTENT_CACHE_DURATION))
+    ancestors = tree.get_ancestors(page)
+    branch = None
+    if ancestors is None:
+        ancestors = page.get_cached_ancestors()
+    elif levels is not None:
+        branch = get_menu_branch(tree, page, ancestors, *levels)
+    if branch is None:
+        branch = [p.pk for p in ancestors] + [page.pk]
+    fingerprint = (
+        generations,
+        cms_context.site.pk,
+        cms_context.language,
+        cms_context.draft,
+        name,
+        args,
+        levels is not None,
+        branch,
+        # extender nodes are selected by path
+        tree.extenders and request.path or None,
+    )
+    return "CMS::Menu::%s" % md5_constructor(repr(fingerprint)).hexdigest()
+
+def get_content_context(content):
+    return {'template': 'cms/content.html', 'content': mark_safe(content)}
+
+def get_cached_menu(key):
+    """Returns context for rendering cached menu, None if there isn't any.
+    """
+    if key is None:
+        return None
+    content = cache.get(key)
+    if content is None:
+        return None
+    return get_content_context(content)
+
+def set_cached_menu(key, context):
+    """Renders menu template with context prepared by menu tag and stores the
+    html under key. Returns context for rendering it, or the given context if
+    key is None.
+    """
+    if key is None:
+        return context
+    content = unicode(get_template(context['template']).render(context))
+    cache.set(key, content, TTL)
+    return get_content_context(content)
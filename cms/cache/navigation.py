@@ -0,0 +1,164 @@
+"""Process local cache of published page trees used by menu tags.
+
+Tree structure changes only when pages or titles change, so all the published
+pages of a site are loaded once for each (site, language, draft/public,
+CMS_HIDE_UNTRANSLATED) combination as NavigationNodes, with titles and
+absolute urls already resolved. Cached nodes are never changed by menus - each
+request works with copies of the nodes it needs (see NavigationTree.get_overlay),
+so selected/ancestor/sibling/descendant flags don't leak to other requests.
+
+Tree is rebuilt when the navigation generation gets bumped (see
+cms.cache.signals). With CMS_SHOW_START_DATE or CMS_SHOW_END_DATE it is also
+rebuilt after CMS_CONTENT_CACHE_DURATION, so pages going live or expiring
+appear in or disappear from menus.
+"""
+import time
+from django.core.urlresolvers import reverse
+from cms import settings
+from cms.exceptions import NoHomeFound
+from cms.utils.urlutils import urljoin
+from cms.utils.navigation import NavigationNode
+from cms.cache.generation import get_generation, bump_generation
+from cms.cache.home import get_home_pk
+
+GENERATION = "navigation"
+
+PAGE_FIELDS = ('id', 'parent', 'tree_id', 'lft', 'rght', 'level', 'soft_root',
+    'reverse_id', 'navigation_extenders', 'in_navigation')
+TITLE_FIELDS = ('page', 'language', 'title', 'menu_title', 'slug', 'path',
+    'has_url_overwrite', 'url')
+
+# {(site_id, language, draft, hide_untranslated): (generation, time, tree)}
+_trees = {}
+
+
+class NavigationTree(object):
+    def __init__(self, nodes, in_navigation, language, hide_untranslated):
+        # all published pages, ordered by tree_id and lft
+        self.all_pages = nodes
+        self.pages_by_pk = dict([(node.pk, node) for node in nodes])
+        # pages which may be shown in menus
+        self.pages = [node for node in nodes if node.pk in in_navigation and
+            (not hide_untranslated or language in node.languages)]
+        # paths of extenders used in menus
+        self.extenders = sorted(set([node.navigation_extenders for node in self.pages
+            if node.navigation_extenders]))
+
+    def get_page(self, pk):
+        return self.pages_by_pk.get(pk, None)
+
+    def get_page_by_reverse_id(self, reverse_id):
+        for node in self.all_pages:
+            if node.reverse_id == reverse_id:
+                return node
+        return None
+
+    def get_ancestors(self, page):
+        """Cached ancestors of given page, root first. None if the page
+        or some of its ancestors isn't in the tree.
+        """
+        node = self.get_page(page.pk)
+        ancestors = []
+        while node is not None and node.parent_id:
+            node = self.get_page(node.parent_id)
+            ancestors.insert(0, node)
+        if node is None:
+            return None
+        return ancestors
+
+    def get_overlay(self, nodes):
+        """Returns copies of given cached nodes, which can get menu attributes
+        assigned.
+        """
+        return [node.copy() for node in nodes]
+
+
+def get_title_url(title, parent_id, root_id, home_pk, pages_root):
+    """Absolute url of page with given title values, the same one which
+    Page.get_absolute_url returns.
+    """
+    if title['url'] is not None:
+        return pages_root + title['url']
+    if settings.CMS_FLAT_URLS:
+        path = title['slug']
+    else:
+        path = title['path']
+        if parent_id and root_id == home_pk and not title['has_url_overwrite']:
+            path = "/".join(path.split("/")[1:])
+    return urljoin(pages_root, path)
+
+def build_tree(site_id, language, draft, hide_untranslated):
+    """Loads navigation columns of all published pages of the site and their
+    titles with two queries, and resolves their urls.
+    """
+    from cms.models import Page, Title
+    from cms.extender_pool import extender_pool
+    # menus may contain extender nodes, connect their invalidation signals
+    extender_pool.discover_extenders()
+    pages = Page.objects.get_query_set().filter(publisher_is_draft=draft).published(site_id)
+    pages = pages.order_by('tree_id', 'lft')
+    titles = Title.objects.filter(page__in=pages.values_list('id', flat=True))
+    page_titles = {}
+    for title in titles.order_by('creation_date').values(*TITLE_FIELDS):
+        page_titles.setdefault(title['page'], []).append(title)
+    try:
+        home_pk = get_home_pk(site_id, draft)
+    except NoHomeFound:
+        home_pk = 0
+    pages_root = reverse('pages-root')
+    nodes, in_navigation, tree_roots = [], set(), {}
+    for values in pages.values(*PAGE_FIELDS):
+        pk, parent_id = values['id'], values['parent']
+        if not parent_id:
+            tree_roots[values['tree_id']] = pk
+        titles = page_titles.get(pk, [])
+        title = None
+        languages = []
+        for page_title in titles:
+            if not page_title['language'] in languages:
+                languages.append(page_title['language'])
+            if page_title['language'] == language:
+                title = page_title
+        if title is None and titles:
+            # latest title is used as fallback
+            title = titles[-1]
+        if title is None:
+            continue
+        if pk == home_pk:
+            url = pages_root
+        else:
+            root_id = tree_roots.get(values['tree_id'], None)
+            url = get_title_url(title, parent_id, root_id, home_pk, pages_root)
+        node = NavigationNode(title['title'], url, menu_title=title['menu_title'],
+            pk=pk, parent_id=parent_id, level=values['level'], is_page=True)
+        node.tree_id, node.lft, node.rght = values['tree_id'], values['lft'], values['rght']
+        node.soft_root = values['soft_root']
+        node.reverse_id = values['reverse_id']
+        node.navigation_extenders = values['navigation_extenders']
+        node.languages = languages
+        if values['in_navigation']:
+            in_navigation.add(pk)
+        nodes.append(node)
+    return NavigationTree(nodes, in_navigation, language, hide_untranslated)
+
+def get_navigation_tree(site_id, language, draft):
+    """Returns cached NavigationTree, builds it if required. Pages in it must
+    not be changed, use get_overlay to get copies.
+    """
+    generation = get_generation(GENERATION)
+    hide_untranslated = settings.CMS_HIDE_UNTRANSLATED
+    key = (site_id, language, bool(draft), hide_untranslated)
+    cached = _trees.get(key, None)
+    expired = False
+    if cached is not None and (settings.CMS_SHOW_START_DATE or settings.CMS_SHOW_END_DATE):
+        # publication dates are checked when the tree is built
+        expired = time.time() - cached[1] > settings.CMS_CONTENT_CACHE_DURATION
+    if cached is None or cached[0] != generation or expired:
+        cached = (generation, time.time(), build_tree(site_id, language, draft, hide_untranslated))
+        _trees[key] = cached
+    return cached[2]
+
+def clear_navigation_cache():
+    """Invalidates navigation trees in all processes.
+    """
+    bump_generation(GENERATION)
@@ -0,0 +1,54 @@
+"""Bounded process local cache of paths which weren't found.
+
+Requests for missing paths (bots, broken links) can be answered with 404
+without asking db again. Entries are dropped whenever anything which may make
+some path resolvable changes - titles, page tree, application hooks, home page
+or visible pages (see the generations below), and also after
+CMS_CONTENT_CACHE_DURATION, so pages going live with CMS_SHOW_START_DATE get
+found.
+"""
+import time
+from collections import deque
+from cms import settings
+from cms.cache.generation import get_generation
+from cms.cache import routing, home, page
+from cms import appresolver
+
+GENERATIONS = (routing.GENERATION, home.GENERATION, page.GENERATION, appresolver.GENERATION)
+
+# {(site_id, draft): (generations, {(language, path): time}, deque of keys)}
+_missing = {}
+
+
+def _get_paths(site_id, draft):
+    generations = tuple([get_generation(name) for name in GENERATIONS])
+    key = (site_id, bool(draft))
+    cached = _missing.get(key, None)
+    if cached is None or cached[0] != generations:
+        cached = (generations, {}, deque())
+        _missing[key] = cached
+    return cached[1], cached[2]
+
+def is_missing(site_id, draft, language, path):
+    """Was this path recently not found?
+    """
+    if not settings.CMS_NOT_FOUND_CACHE_SIZE:
+        return False
+    paths = _get_paths(site_id, draft)[0]
+    missed = paths.get((language, path), None)
+    return missed is not None and time.time() - missed < settings.CMS_CONTENT_CACHE_DURATION
+
+def set_missing(site_id, draft, language, path):
+    """Remembers path which wasn't found, oldest entries get dropped when
+    there is more than CMS_NOT_FOUND_CACHE_SIZE of them.
+    """
+    if not settings.CMS_NOT_FOUND_CACHE_SIZE:
+        return
+    paths, order = _get_paths(site_id, draft)
+    key = (language, path)
+    if not key in paths:
+        order.append(key)
+    paths[key] = time.time()
+    while len(order) > settings.CMS_NOT_FOUND_CACHE_SIZE:
+        # concurrent requests may append the same key twice
+        paths.pop(order.popleft(), None)
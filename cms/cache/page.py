@@ -0,0 +1,163 @@
+"""Full page response cache and conditional GET for cms.views.details.
+
+Enabled by CMS_PAGE_CACHE and CMS_PAGE_CONDITIONAL_GET. Both are used only for
+anonymous visitors and rely on the pages generation, which gets bumped
+whenever the content served to visitors changes (see cms.cache.signals), not
+after some fixed time.
+"""
+from email.Utils import parsedate_tz, mktime_tz
+from django.core.cache import cache
+from django.http import HttpResponseNotModified
+from django.utils.hashcompat import md5_constructor
+from django.utils.http import http_date, parse_etags, quote_etag
+from cms import settings
+from cms.utils.cmscontext import get_cms_context
+from cms.cache.generation import get_generation, bump_generation
+
+GENERATION = "pages"
+
+# query parameters which are part of the cache key, requests with any other
+# parameters aren't cached, so arbitrary query strings can't flood the cache
+CACHED_PARAMETERS = ('template',)
+
+def get_page_cache_key(request, language):
+    """Cache key for given request - contains site, language, path and
+    template, so requests with ?template=... don't share the response.
+    """
+    path = md5_constructor(request.path.encode('utf-8')).hexdigest()
+    return "CMS::Page::%s::%s::%s::%s::%s" % (
+        get_generation(GENERATION),
+        settings.SITE_ID,
+        language,
+        path,
+        request.GET.get('template', ''),
+    )
+
+def is_anonymous_request(request):
+    """Only anonymous GET/HEAD requests without preview get the same response
+    as all the other visitors.
+    """
+    if not request.method in ('GET', 'HEAD') or 'preview' in request.GET:
+        return False
+    user = getattr(request, 'user', None)
+    return not (user and user.is_authenticated())
+
+def is_cacheable_request(request):
+    if not settings.CMS_PAGE_CACHE or not is_anonymous_request(request):
+        return False
+    for name in request.GET.keys():
+        if not name in CACHED_PARAMETERS:
+            return False
+    return True
+
+def is_cacheable_response(request, response):
+    page = getattr(request, '_current_page_cache', None)
+    if not page or page.login_required:
+        return False
+    return response.status_code == 200
+
+def get_cached_response(request, language):
+    return cache.get(get_page_cache_key(request, language))
+
+def set_cached_response(request, language, response):
+    cache.set(get_page_cache_key(request, language), response, settings.CMS_PAGE_CACHE_DURATION)
+
+def clear_page_cache():
+    """Invalidates all the cached responses, in all processes.
+    """
+    bump_generation(GENERATION)
+
+def is_conditional_request(request):
+    return settings.CMS_PAGE_CONDITIONAL_GET and is_anonymous_request(request)
+
+def get_page_etag(request, page, language):
+    """Fingerprint of page response, built just from things which are already
+    loaded when the page is found, so no template gets touched.
+    """
+    title = page.get_title_obj(language=language, fallback=True)
+    fingerprint = (
+        get_generation(GENERATION),
+        settings.SITE_ID,
+        language,
+        request.get_full_path(),
+        page.pk,
+        page.published,
+        page.publication_date,
+        page.publication_end_date,
+        page.template,
+        getattr(title, 'pk', None),
+        getattr(title, 'path', None),
+        getattr(title, 'redirect', None),
+    )
+    return md5_constructor(repr(fingerprint)).hexdigest()
+
+def get_last_modified():
+    """Pages generation is bumped at least to current time in milliseconds, so
+    it also says when was the content changed last time.
+    """
+    return get_generation(GENERATION) // 1000
+
+def was_modified(request, etag, last_modified):
+    """If-None-Match takes precedence, If-Modified-Since is used only when
+    there isn't any.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', None)
+    if if_none_match is not None:
+        etags = parse_etags(if_none_match)
+        return not (etag in etags or '*' in etags)
+    if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE', None)
+    if if_modified_since is None:
+        return True
+    try:
+        return last_modified > mktime_tz(parsedate_tz(if_modified_since.split(';')[0]))
+    except (TypeError, ValueError, OverflowError):
+        return True
+
+def set_conditional_headers(response, etag, last_modified):
+    response['ETag'] = quote_etag(etag)
+    response['Last-Modified'] = http_date(last_modified)
+    # keep them also in original form, cached responses are checked with them
+    response._cms_conditional = (etag, last_modified)
+    return response
+
+def get_not_modified_response(request, page, language):
+    """Returns 304 response if client has the current version of page, None
+    otherwise. Validators get remembered on request, so the rendered response
+    can get them too.
+    """
+    etag, last_modified = get_page_etag(request, page, language), get_last_modified()
+    request._cms_conditional = (etag, last_modified)
+    if was_modified(request, etag, last_modified):
+        return None
+    return set_conditional_headers(HttpResponseNotModified(), etag, last_modified)
+
+def cache_page_response(func):
+    """Decorator for cms details view, serves cached response if there is one.
+    """
+    def _dec(request, *args, **kwargs):
+        if kwargs.get('only_context', False) or not is_cacheable_request(request):
+            return func(request, *args, **kwargs)
+        language = get_cms_context(request).language
+        response = get_cached_response(request, language)
+        if response is None:
+            response = func(request, *args, **kwargs)
+            if is_cacheable_response(request, response):
+                set_cached_response(request, language, response)
+        elif is_conditional_request(request) and hasattr(response, '_cms_conditional'):
+            etag, last_modified = response._cms_conditional
+            if not was_modified(request, etag, last_modified):
+                return set_conditional_headers(HttpResponseNotModified(), etag, last_modified)
+        return response
+    return _dec
+
+def conditional_page_response(func):
+    """Decorator for cms details view, adds validators found by the view to
+    rendered response.
+    """
+    def _dec(request, *args, **kwargs):
+        response = func(request, *args, **kwargs)
+        validators = getattr(request, '_cms_conditional', None)
+        if validators and not kwargs.get('only_context', False) and response.status_code == 200:
+            set_conditional_headers(response, *validators)
+        return response
+    return _dec
@@ -0,0 +1,60 @@
+"""Rendered html of placeholders.
+
+Placeholder is cached if all its plugins can be cached (see cms.cache.plugins),
+under the same generations as plugins of its page, so any plugin add, change,
+move or delete on the page and any publish of the page invalidates it. Caching can be turned off and
+timeout set for each placeholder in CMS_PLACEHOLDER_CONF:
+
+    CMS_PLACEHOLDER_CONF = {
+        'content': {'cache': False},
+        'footer': {'cache_timeout': 60 * 60 * 24},
+    }
+"""
+from django.core.cache import cache
+from django.utils.encoding import smart_str
+from django.utils.hashcompat import md5_constructor
+from cms import settings
+from cms.cache.plugins import get_context_generations, get_vary_values,\
+    is_cached_draft
+
+
+def get_placeholder_conf(name, key, default=None):
+    if settings.CMS_PLACEHOLDER_CONF and name in settings.CMS_PLACEHOLDER_CONF:
+        return settings.CMS_PLACEHOLDER_CONF[name].get(key, default)
+    return default
+
+def get_placeholder_cache_key(context, page, language, draft, name, plugins):
+    """Cache key for placeholder with given plugins, None if it can't be
+    cached.
+    """
+    if not get_placeholder_conf(name, 'cache', True) or not is_cached_draft(draft):
+        return None
+    vary_on = []
+    for plugin in plugins:
+        instance, plugin_class = plugin.get_plugin_instance()
+        if instance is None:
+            continue
+        if not plugin_class.cache:
+            return None
+        vary_on.extend(plugin_class.cache_vary_on)
+    fingerprint = (
+        get_context_generations(context, page.pk),
+        page.pk,
+        # names come as str or unicode
+        smart_str(language),
+        draft,
+        smart_str(name),
+        context.get('theme', None),
+        get_vary_values(context, sorted(set(vary_on))),
+    )
+    return "CMS::Placeholder::%s" % md5_constructor(repr(fingerprint)).hexdigest()
+
+def get_cached_placeholder(key):
+    if key is None:
+        return None
+    return cache.get(key)
+
+def set_cached_placeholder(key, name, content):
+    if key is not None:
+        timeout = get_placeholder_conf(name, 'cache_timeout', None)
+        cache.set(key, content, timeout or settings.CMS_CONTENT_CACHE_DURATION)
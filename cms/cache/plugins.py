@@ -0,0 +1,83 @@
+"""Rendered html of plugins which declare it can be cached (see cache options
+of CMSPluginBase).
+
+Html is keyed on plugin pk, the plugins generation of its page which gets
+bumped when any plugin of the page is saved or deleted, and the navigation
+generation, because plugins may link to pages. Text plugins contain their
+child plugins, which are always on the same page. Plugins can add context
+values their output depends on.
+
+With CMS_MODERATOR draft plugins change on every admin edit and are rendered
+only in previews, so they aren't cached at all, and only saves of public
+plugins (done on publish) bump the generation.
+"""
+from django.core.cache import cache
+from django.template import Variable, VariableDoesNotExist
+from django.utils.encoding import smart_str
+from django.utils.hashcompat import md5_constructor
+from cms import settings
+from cms.cache.generation import get_generation, bump_generation
+from cms.cache import navigation
+
+GENERATION = "plugins"
+
+get_generation_name = lambda page_id: "%s::%s" % (GENERATION, page_id)
+
+
+def get_plugin_generations(page_id):
+    return (get_generation(get_generation_name(page_id)), get_generation(navigation.GENERATION))
+
+def get_context_generations(context, page_id):
+    """Generations are read once for each page and request.
+    """
+    request = context.get('request', None)
+    if request is None:
+        return get_plugin_generations(page_id)
+    from cms.utils.cmscontext import get_cms_context
+    return get_cms_context(request).get_plugin_generations(page_id)
+
+def is_cached_draft(draft):
+    """Drafts are cached only if they are the live content.
+    """
+    return not (draft and settings.CMS_MODERATOR)
+
+def get_vary_values(context, names):
+    """Values of given context variables, as strings.
+    """
+    values = []
+    for name in names:
+        try:
+            values.append(repr(Variable(name).resolve(context)))
+        except VariableDoesNotExist:
+            values.append(None)
+    return values
+
+def get_plugin_cache_key(instance, plugin, context, placeholder):
+    """Cache key for rendered instance, None if its plugin doesn't allow
+    caching.
+    """
+    if not plugin.cache or not is_cached_draft(instance.publisher_is_draft):
+        return None
+    fingerprint = (
+        get_context_generations(context, instance.page_id),
+        instance.pk,
+        smart_str(placeholder),
+        get_vary_values(context, plugin.cache_vary_on),
+    )
+    return "CMS::Plugin::%s" % md5_constructor(repr(fingerprint)).hexdigest()
+
+def get_cached_plugin(key):
+    if key is None:
+        return None
+    return cache.get(key)
+
+def set_cached_plugin(key, plugin, content):
+    if key is not None:
+        timeout = plugin.cache_timeout or settings.CMS_CONTENT_CACHE_DURATION
+        cache.set(key, content, timeout)
+
+def clear_plugin_cache(page_id):
+    """Invalidates rendered plugins and placeholders of given page in all
+    processes.
+    """
+    bump_generation(get_generation_name(page_id))
@@ -0,0 +1,102 @@
+"""In-memory index of title paths used for resolving urls to pages.
+
+Index is built in bulk from Title.path and Title.slug for each (site, 
+draft/public) combination and gets rebuilt lazily when the routing generation
+is bumped from signals (see cms.cache.signals).
+"""
+from cms import settings
+from cms.cache.generation import get_generation, bump_generation
+
+GENERATION = "routing"
+
+# {(site_id, draft): (generation, paths, slugs, languages)}, where
+#   paths = {language: {path: [(page_id, tree_id), ...]}}
+#   slugs = {language: {slug: [(page_id, tree_id), ...]}}
+#   languages = {page_id: [language, ...]}
+#   page_slugs = {page_id: {language: slug}}, latest slug under None
+_indexes = {}
+
+
+def build_index(site_id, draft):
+    """Builds routing index for given site and publisher state with a single
+    query.
+    """
+    from cms.models import Title
+    titles = Title.objects.filter(page__site=site_id, publisher_is_draft=draft)
+    titles = titles.order_by('page__tree_id', 'page__lft', 'creation_date').values_list(
+        'page', 'page__tree_id', 'language', 'path', 'slug')
+    paths, slugs, languages, page_slugs = {}, {}, {}, {}
+    for page_id, tree_id, language, path, slug in titles:
+        paths.setdefault(language, {}).setdefault(path, []).append((page_id, tree_id))
+        slugs.setdefault(language, {}).setdefault(slug, []).append((page_id, tree_id))
+        page_languages = languages.setdefault(page_id, [])
+        if not language in page_languages:
+            page_languages.append(language)
+        page_slugs.setdefault(page_id, {})[language] = slug
+        page_slugs[page_id][None] = slug
+    return paths, slugs, languages, page_slugs
+
+
+def get_index(site_id, draft):
+    """Returns (paths, slugs, languages, page_slugs) routing index, builds it
+    if required.
+    """
+    generation = get_generation(GENERATION)
+    key = (site_id, bool(draft))
+    index = _indexes.get(key, None)
+    if index is None or index[0] != generation:
+        index = (generation,) + build_index(site_id, draft)
+        _indexes[key] = index
+    return index[1:]
+
+
+def get_page_ids(site_id, draft, path, language, home_slug=None, home_tree_id=None):
+    """Returns list of ids of pages which may be served under given path.
+    Follows the same rules like the title lookup in cms.views does:
+
+        - home page isn't reachable over its slug
+        - pages from home tree are reachable also without home slug prefix
+        - plain slug is used if there isn't any home slug
+        - language matters only when CMS_FLAT_URLS
+    """
+    paths, slugs, languages, page_slugs = get_index(site_id, draft)
+    excluded = []
+    if home_slug:
+        path_maps = paths
+        for path_map in paths.values():
+            for page_id, tree_id in path_map.get(home_slug, ()):
+                if tree_id == home_tree_id:
+                    excluded.append(page_id)
+    else:
+        path_maps = slugs
+    if settings.CMS_FLAT_URLS:
+        path_maps = [path_maps.get(language, {})]
+    else:
+        path_maps = path_maps.values()
+    page_ids = []
+    for path_map in path_maps:
+        for page_id, tree_id in path_map.get(path, ()):
+            page_ids.append(page_id)
+        if home_slug:
+            for page_id, tree_id in path_map.get("%s/%s" % (home_slug, path), ()):
+                if tree_id == home_tree_id:
+                    page_ids.append(page_id)
+    return [page_id for page_id in page_ids if not page_id in excluded]
+
+def get_page_languages(site_id, draft, page_id):
+    """Returns list of languages in which is given page available.
+    """
+    return get_index(site_id, draft)[2].get(page_id, [])
+
+def get_page_slug(site_id, draft, page_id, language):
+    """Returns slug of given page in language, latest slug if it isn't
+    translated (like page.get_slug does), None if page has no titles.
+    """
+    page_slugs = get_index(site_id, draft)[3].get(page_id, {})
+    return page_slugs.get(language, page_slugs.get(None, None))
+
+
+def clear_routing_index():
+    """Invalidates routing index in all processes.
+    """
+    bump_generation(GENERATION)
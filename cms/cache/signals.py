@@ -1,9 +1,17 @@
 from django.db.models import signals
 from django.contrib.auth.models import User, Group
 from cms import settings
-from cms.models import PagePermission, GlobalPagePermission, Page
+from cms.models import PagePermission, GlobalPagePermission, Page, Title,\
+    CMSPlugin
 from cms.cache.permissions import clear_user_permission_cache,\
     clear_permission_cache
+from cms.cache.routing import clear_routing_index
+from cms.cache.page import clear_page_cache
+from cms.cache.home import clear_home_cache
+from cms.cache.navigation import clear_navigation_cache
+from cms.cache.plugins import clear_plugin_cache, is_cached_draft
+from cms.utils.moderator import use_draft
+from cms.utils.identity import clear_identity_map
 from cms.models import signals as cms_signals
 
 def pre_save_user(instance, raw, **kwargs):
@@ -56,4 +64,68 @@ if settings.CMS_PERMISSION:
     signals.pre_delete.connect(pre_delete_globalpagepermission, sender=GlobalPagePermission)
     
     signals.pre_save.connect(pre_save_delete_page, sender=Page)
-    signals.pre_delete.connect(pre_save_delete_page, sender=Page)
\ No newline at end of file
+    signals.pre_delete.connect(pre_save_delete_page, sender=Page)
+
+
+def is_visible(instance):
+    """Is the instance served to visitors? Public instances are served only
+    if CMS_MODERATOR, drafts otherwise.
+    """
+    return instance.publisher_is_draft == use_draft()
+
+def post_save_delete_title(instance, **kwargs):
+    clear_routing_index()
+    clear_navigation_cache()
+    clear_identity_map()
+    if is_visible(instance):
+        clear_page_cache()
+
+def post_save_delete_page(instance, **kwargs):
+    clear_home_cache()
+    clear_navigation_cache()
+    clear_identity_map()
+    if is_visible(instance):
+        clear_page_cache()
+
+def post_save_delete_plugin(instance, **kwargs):
+    # sender may be any of plugin models
+    if isinstance(instance, CMSPlugin) and is_visible(instance):
+        clear_page_cache()
+
+def post_save_delete_cached_plugin(instance, **kwargs):
+    if not isinstance(instance, CMSPlugin):
+        return
+    if not is_cached_draft(instance.publisher_is_draft):
+        # publish saves the public plugins
+        return
+    # parents of child plugins (e.g. text) are on the same page
+    clear_plugin_cache(instance.page_id)
+
+def post_move_publish_page(instance, **kwargs):
+    clear_routing_index()
+    clear_home_cache()
+    clear_navigation_cache()
+    clear_identity_map()
+    clear_page_cache()
+    if instance.publisher_public_id:
+        # public plugins of the page, however publisher replaced them
+        clear_plugin_cache(instance.publisher_public_id)
+
+
+# title paths and page positions are used in routing index, any page change
+# may change the home page and navigation trees
+signals.post_save.connect(post_save_delete_title, sender=Title)
+signals.post_delete.connect(post_save_delete_title, sender=Title)
+signals.post_save.connect(post_save_delete_page, sender=Page)
+signals.post_delete.connect(post_save_delete_page, sender=Page)
+cms_signals.page_moved.connect(post_move_publish_page, sender=Page)
+cms_signals.post_publish.connect(post_move_publish_page, sender=Page)
+
+# rendered plugins and placeholders of the plugin's page
+signals.post_save.connect(post_save_delete_cached_plugin)
+signals.post_delete.connect(post_save_delete_cached_plugin)
+
+if settings.CMS_PAGE_CACHE or settings.CMS_PAGE_CONDITIONAL_GET:
+    # anything visible in page response
+    signals.post_save.connect(post_save_delete_plugin)
+    signals.post_delete.connect(post_save_delete_plugin)
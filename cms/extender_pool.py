@@ -0,0 +1,106 @@
+"""Registry of navigation extenders (see CMS_NAVIGATION_EXTENDERS).
+
+Extender functions are imported just once, when the first menu of the process
+gets built, not on cms import, so extender modules may import cms models. Extenders which return the same
+nodes for all the requests may say so with the cached_extender decorator,
+their nodes are then kept in memory and each request gets its own copies.
+"""
+import copy
+import time
+import warnings
+from cms import settings
+from cms.cache.generation import get_generation, bump_generation
+
+
+def cached_extender(timeout, signals=()):
+    """Decorator for extender functions whose nodes depend only on the
+    language. Nodes are reused for timeout seconds, or until any of given
+    (signal, sender) pairs is sent, e.g. ((post_save, Category),).
+    """
+    def _dec(func):
+        func.cache_timeout = timeout
+        func.invalidation_signals = tuple(signals)
+        return func
+    return _dec
+
+def copy_nodes(nodes):
+    """Copies nodes with all their childrens, so menu attributes assigned
+    during request don't get to the cached nodes.
+    """
+    result = []
+    for node in nodes:
+        node = copy.copy(node)
+        node.childrens = copy_nodes(getattr(node, 'childrens', []))
+        result.append(node)
+    return result
+
+get_generation_name = lambda path: "extender::%s" % path
+
+
+class ExtenderPool(object):
+    def __init__(self):
+        # {path: function}
+        self.extenders = {}
+        # {(path, language): (generation, time, nodes)}
+        self.nodes = {}
+        self.discovered = False
+
+    def discover_extenders(self):
+        if self.discovered:
+            return
+        self.discovered = True
+        for path, name in settings.CMS_NAVIGATION_EXTENDERS:
+            try:
+                self.register_extender(path)
+            except (ImportError, AttributeError), e:
+                # broken extender fails only in menus which use it
+                warnings.warn("Navigation extender %s can't be imported: %s" % (path, e))
+
+    def register_extender(self, path):
+        """Imports extender function and connects its invalidation signals.
+        """
+        if path in self.extenders:
+            return self.extenders[path]
+        module_name, func_name = path.rsplit(".", 1)
+        func = getattr(__import__(module_name, {}, {}, [func_name]), func_name)
+        for signal, sender in getattr(func, 'invalidation_signals', ()):
+            signal.connect(self._get_invalidator(path), sender=sender, weak=False,
+                dispatch_uid="cms-extender-%s-%s" % (path, id(signal)))
+        self.extenders[path] = func
+        return func
+
+    def _get_invalidator(self, path):
+        def invalidate(**kwargs):
+            self.clear_nodes(path)
+        return invalidate
+
+    def get_extender(self, path):
+        self.discover_extenders()
+        if not path in self.extenders:
+            # not in settings anymore, but still set on some page
+            return self.register_extender(path)
+        return self.extenders[path]
+
+    def get_nodes(self, request, path, language):
+        """Returns nodes of extender with given path, copies of cached ones if
+        the extender is cached.
+        """
+        func = self.get_extender(path)
+        timeout = getattr(func, 'cache_timeout', None)
+        if not timeout:
+            return func(request)
+        generation = get_generation(get_generation_name(path))
+        key = (path, language)
+        cached = self.nodes.get(key, None)
+        if cached is None or cached[0] != generation or time.time() - cached[1] > timeout:
+            cached = (generation, time.time(), func(request))
+            self.nodes[key] = cached
+        return copy_nodes(cached[2])
+
+    def clear_nodes(self, path):
+        """Invalidates cached nodes of given extender in all processes.
+        """
+        bump_generation(get_generation_name(path))
+
+
+extender_pool = ExtenderPool()
@@ -0,0 +1,45 @@
+import os
+from optparse import make_option
+from django.core.management.base import BaseCommand
+from django.contrib.sites.models import Site
+from cms.utils.sitemap import get_section_count, iter_page_urls, iter_urlset,\
+    iter_sitemap_index, gzip_stream
+
+
+class Command(BaseCommand):
+    help = ("Writes sitemap.xml of cms pages for current site to given directory. "
+        "Sites with too many pages get sitemap index and sitemap-N.xml sections.")
+    args = "directory [base_url]"
+    option_list = BaseCommand.option_list + (
+        make_option('--gzip', action='store_true', dest='gzip', default=False,
+            help='Write gzipped files (sitemap.xml.gz).'),
+    )
+
+    def write(self, path, content, compress):
+        if compress:
+            content = gzip_stream(content)
+        f = open(path, 'wb')
+        try:
+            for piece in content:
+                f.write(piece)
+        finally:
+            f.close()
+
+    def handle(self, directory='.', base_url=None, **options):
+        site = Site.objects.get_current()
+        if base_url is None:
+            base_url = "http://%s" % site.domain
+        base_url = base_url.rstrip("/")
+        extension = options.get('gzip') and "xml.gz" or "xml"
+        count = get_section_count(site.pk)
+        if count > 1:
+            locations = []
+            for section in range(1, count + 1):
+                name = "sitemap-%d.%s" % (section, extension)
+                content = iter_urlset(iter_page_urls(site.pk, base_url, section))
+                self.write(os.path.join(directory, name), content, options.get('gzip'))
+                locations.append("%s/%s" % (base_url, name))
+            content = iter_sitemap_index(locations)
+        else:
+            content = iter_urlset(iter_page_urls(site.pk, base_url))
+        self.write(os.path.join(directory, "sitemap.%s" % extension), content, options.get('gzip'))
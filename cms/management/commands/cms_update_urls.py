@@ -0,0 +1,20 @@
+from django.core.management.base import NoArgsCommand
+from django.contrib.sites.models import Site
+from cms.models import Title
+from cms.cache.home import find_home
+from cms.cache.navigation import clear_navigation_cache
+from cms.cache.page import clear_page_cache
+from cms.utils.page import update_title_urls
+
+
+class Command(NoArgsCommand):
+    help = ("Builds urls of all page titles again. Run it after upgrade and "
+        "after change of CMS_FLAT_URLS or APPEND_SLASH setting.")
+
+    def handle_noargs(self, **options):
+        for site in Site.objects.all():
+            for draft in (True, False):
+                titles = Title.objects.filter(page__site=site, page__publisher_is_draft=draft)
+                update_title_urls(titles, find_home(site.pk, draft))
+        clear_navigation_cache()
+        clear_page_cache()
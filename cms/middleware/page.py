@@ -1,4 +1,6 @@
 from cms.utils import get_page_from_request
+from cms.utils.cmscontext import CMSContext
+from cms.utils.identity import set_identity_map
 
 class LazyPage(object):
     def __get__(self, request, obj_type=None):
@@ -9,4 +11,10 @@ class LazyPage(object):
 class CurrentPageMiddleware(object):
     def process_request(self, request):
         request.__class__.current_page = LazyPage()
+        request.cms = CMSContext(request)
+        set_identity_map(request.cms.identity_map)
         return None
+    
+    def process_response(self, request, response):
+        set_identity_map(None)
+        return response
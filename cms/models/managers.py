@@ -88,6 +88,9 @@ class PageManager(PublisherManager):
     
     def get_home(self, site=None):
         return self.get_query_set().get_home(site)
+    
+    def with_titles(self, language, fallback=True):
+        return self.get_query_set().with_titles(language, fallback)
 
             
         
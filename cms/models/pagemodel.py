@@ -13,7 +13,10 @@ from cms import settings
 from cms.models.managers import PageManager, PagePermissionsPermissionManager
 from cms.models import signals as cms_signals
 from cms.utils.page import get_available_slug
+from cms.utils.plugins import downcast_plugins
+from cms.utils.identity import get_identity_map
 from cms.exceptions import NoHomeFound
+from cms.cache.home import get_home_pk
 
 
 
@@ -117,6 +120,7 @@ class Page(MpttPublisher):
            
             titles = list(page.title_set.all())
             plugins = list(page.cmsplugin_set.all().order_by('tree_id', '-rght'))
+            downcast_plugins(plugins)
             
             origin_id = page.id
             # IMPORTANT NOTE: self gets changed in next few lines to page!!
@@ -302,6 +306,13 @@ class Page(MpttPublisher):
         return self.languages_cache
 
     def get_absolute_url(self, language=None, fallback=True):
+        if language is None and fallback and hasattr(self, 'absolute_url_cache'):
+            # resolved already, see cms.cache.navigation
+            return self.absolute_url_cache
+        url = self.get_title_obj_attribute("url", language, fallback)
+        if url is not None:
+            return reverse('pages-root') + url
+        # title url wasn't built yet
         try:
             if self.is_home():
                 return reverse('pages-root')
@@ -326,7 +337,11 @@ class Page(MpttPublisher):
     def get_cached_ancestors(self, ascending=True):
         if ascending:
             if not hasattr(self, "ancestors_ascending"):
-                self.ancestors_ascending = list(self.get_ancestors(ascending)) 
+                identity_map = get_identity_map()
+                if identity_map and self.pk:
+                    self.ancestors_ascending = identity_map.get_ancestors(self)
+                else:
+                    self.ancestors_ascending = list(self.get_ancestors(ascending)) 
             return self.ancestors_ascending
         else:
             if not hasattr(self, "ancestors_descending"):
@@ -443,7 +458,14 @@ class Page(MpttPublisher):
                             if obj.page_id == self.pk:
                                 self.title_cache = obj
             else:
-                self.title_cache = Title.objects.get_title(self, language, language_fallback=fallback)
+                identity_map = get_identity_map()
+                if identity_map and self.pk:
+                    title = identity_map.get_title(self, language, fallback, force_reload)
+                    if title is None and not fallback:
+                        raise Title.DoesNotExist("Title matching query does not exist.")
+                    self.title_cache = title
+                else:
+                    self.title_cache = Title.objects.get_title(self, language, language_fallback=fallback)
                 
     def get_template(self):
         """
@@ -561,7 +583,7 @@ class Page(MpttPublisher):
     def get_home_pk_cache(self):
         attr = "%s_home_pk_cache" % (self.publisher_is_draft and "draft" or "public")
         if not hasattr(self, attr):
-            setattr(self, attr, self.get_object_queryset().get_home().pk)
+            setattr(self, attr, get_home_pk(settings.SITE_ID, self.publisher_is_draft))
         return getattr(self, attr)
 
     
@@ -66,9 +66,15 @@ class CMSPlugin(MpttPublisher):
         
     def get_plugin_instance(self, admin=None):
         from cms.plugin_pool import plugin_pool
-        plugin_class = plugin_pool.get_plugin(self.plugin_type)
-        plugin = plugin_class(plugin_class.model, admin)# needed so we have the same signature as the original ModelAdmin
-        if plugin.model != self.__class__: # and self.__class__ == CMSPlugin:
+        if admin is None:
+            plugin = plugin_pool.get_shared_plugin(self.plugin_type)
+        else:
+            plugin_class = plugin_pool.get_plugin(self.plugin_type)
+            plugin = plugin_class(plugin_class.model, admin)# needed so we have the same signature as the original ModelAdmin
+        if hasattr(self, 'instance_cache'):
+            # loaded already, see cms.utils.plugins.downcast_plugins
+            instance = self.instance_cache
+        elif plugin.model != self.__class__: # and self.__class__ == CMSPlugin:
             # (if self is actually a subclass, getattr below would break)
             try:
                 if hasattr(self, '_is_public_model'):
@@ -85,15 +91,29 @@ class CMSPlugin(MpttPublisher):
         return instance, plugin
     
     def render_plugin(self, context=None, placeholder=None):
+        from cms.cache.plugins import get_plugin_cache_key, get_cached_plugin,\
+            set_cached_plugin
         instance, plugin = self.get_plugin_instance()
         if context is None:
             context = Context()
         if instance:
-            context = plugin.render(context, instance, placeholder)
+            key = get_plugin_cache_key(instance, plugin, context, placeholder)
+            content = get_cached_plugin(key)
+            if content is not None:
+                return mark_safe(content)
+            # child plugins (e.g. in text) mark the context if they can't be
+            # cached, then the html of this one can't be cached either
+            outer_uncacheable = getattr(context, 'uncacheable_plugin', False)
+            context.uncacheable_plugin = key is None
+            plugin_context = plugin.render(context, instance, placeholder)
             template = hasattr(instance, 'render_template') and instance.render_template or plugin.render_template
             if not template:
                 raise ValidationError("plugin has no render_template: %s" % plugin.__class__)
-            return mark_safe(render_to_string(template, context))
+            content = render_to_string(template, plugin_context)
+            if not context.uncacheable_plugin:
+                set_cached_plugin(key, plugin, content)
+            context.uncacheable_plugin = outer_uncacheable or context.uncacheable_plugin
+            return mark_safe(content)
         else:
             return ""
             
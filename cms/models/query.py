@@ -5,11 +5,64 @@ from django.contrib.sites.models import Site
 from publisher.query import PublisherQuerySet
 from cms import settings
 from cms.exceptions import NoHomeFound
+from cms.utils.identity import get_identity_map
 
 #from cms.utils.urlutils import levelize_path
 
 
+def attach_titles(pages, language, fallback=True):
+    """Loads titles of all given pages with single query and sets their 
+    title_cache and languages_cache. Pages which aren't translated to language
+    get their latest title if fallback is allowed, like get_title_obj does.
+    Returns list of pages.
+    """
+    from cms.models.titlemodels import Title
+    pages = list(pages)
+    titles = {}
+    if pages:
+        page_titles = Title.objects.filter(page__in=[page.pk for page in pages])
+        for title in page_titles.order_by('creation_date'):
+            titles.setdefault(title.page_id, []).append(title)
+    identity_map = get_identity_map()
+    for page in pages:
+        page_titles = titles.get(page.pk, [])
+        page.languages_cache = []
+        title = None
+        for page_title in page_titles:
+            if not page_title.language in page.languages_cache:
+                page.languages_cache.append(page_title.language)
+            if page_title.language == language:
+                title = page_title
+        if identity_map:
+            identity_map.add_titles(page_titles, [page.pk], language)
+            if page_titles:
+                identity_map.titles[(page.pk, None)] = page_titles[-1]
+        if title is None and fallback and page_titles:
+            title = page_titles[-1]
+        page.title_cache = title
+    return pages
+
+
 class PageQuerySet(PublisherQuerySet):
+    # (language, fallback) if titles should be attached to pages
+    _with_titles = None
+    
+    def _clone(self, *args, **kwargs):
+        kwargs.setdefault('_with_titles', self._with_titles)
+        return super(PageQuerySet, self)._clone(*args, **kwargs)
+    
+    def iterator(self):
+        iterator = super(PageQuerySet, self).iterator()
+        if self._with_titles is None:
+            return iterator
+        return iter(attach_titles(iterator, *self._with_titles))
+    
+    def with_titles(self, language, fallback=True):
+        """Pages get their titles in given language attached when the 
+        queryset is evaluated, see attach_titles.
+        """
+        return self._clone(_with_titles=(language, fallback))
+    
     def on_site(self, site=None):
         if not site:
             site = Site.objects.get_current()
@@ -46,7 +99,7 @@ class PageQuerySet(PublisherQuerySet):
             return self.exclude(id__in=exclude_list)
 
     def published(self, site=None):
-        pub = self.on_site().filter(published=True)
+        pub = self.on_site(site).filter(published=True)
 
         if settings.CMS_SHOW_START_DATE:
             pub = pub.filter(
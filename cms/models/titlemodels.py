@@ -14,6 +14,8 @@ class Title(Publisher):
     slug = models.SlugField(_("slug"), max_length=255, db_index=True, unique=False)
     path = models.CharField(_("path"), max_length=255, db_index=True)
     has_url_overwrite = models.BooleanField(_("has url overwrite"), default=False, db_index=True, editable=False)
+    # url relative to pages root, built on save, see cms.utils.page.get_title_url
+    url = models.CharField(_("url"), max_length=255, null=True, editable=False)
     application_urls = models.CharField(_('application'), max_length=200, choices=settings.CMS_APPLICATIONS_URLS, blank=True, null=True, db_index=True)
     redirect = models.CharField(_("redirect"), max_length=255, blank=True, null=True)
     meta_description = models.TextField(_("description"), max_length=255, blank=True, null=True)
@@ -75,6 +77,7 @@ class EmptyTitle(object):
     meta_keywords = ""
     redirect = ""
     has_url_overwite = False
+    url = None
     application_urls = ""
     menu_title = ""
     page_title = ""
@@ -17,6 +17,12 @@ class CMSPluginBase(admin.ModelAdmin):
     placeholders = None # a tupple with placeholder names this plugin can be placed. All if empty
     text_enabled = False
     
+    # rendered html can be cached, if it depends only on the instance and
+    # on context values listed in cache_vary_on, see cms.cache.plugins
+    cache = False
+    cache_timeout = None # CMS_CONTENT_CACHE_DURATION if None
+    cache_vary_on = ()
+    
     def __init__(self, model=None,  admin_site=None):
         if self.model:
             if not CMSPlugin in self.model._meta.parents and self.model != CMSPlugin:
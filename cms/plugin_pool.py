@@ -7,6 +7,8 @@ from cms.plugin_base import CMSPluginBase
 class PluginPool(object):
     def __init__(self):
         self.plugins = {}
+        # {name: plugin instance}
+        self.shared_plugins = {}
         self.discovered = False
         
     def discover_plugins(self):
@@ -68,6 +70,16 @@ class PluginPool(object):
         self.discover_plugins()
         return self.plugins[name]
 
+    def get_shared_plugin(self, name):
+        """
+        Retrieve an instance of plugin used for rendering, it's created just
+        once. Admin views create their own instances.
+        """
+        if not name in self.shared_plugins:
+            plugin_class = self.get_plugin(name)
+            self.shared_plugins[name] = plugin_class(plugin_class.model)
+        return self.shared_plugins[name]
+
 
 plugin_pool = PluginPool()
 
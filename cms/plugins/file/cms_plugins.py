@@ -9,6 +9,7 @@ class FilePlugin(CMSPluginBase):
     model = File
     name = _("File")
     render_template = "cms/plugins/file.html"
+    cache = True
     text_enabled = True
     
     def render(self, context, instance, placeholder):  
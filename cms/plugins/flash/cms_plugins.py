@@ -12,6 +12,8 @@ class FlashPlugin(CMSPluginBase):
     form = FlashForm
     
     render_template = "cms/plugins/flash.html"
+    cache = True
+    cache_vary_on = ('LANGUAGE_CODE',)
     def render(self, context, instance, placeholder):
         context.update({
             'object': instance,
@@ -11,6 +11,9 @@ class LinkPlugin(CMSPluginBase):
     form = LinkForm
     name = _("Link")
     render_template = "cms/plugins/link.html"
+    cache = True
+    # links to pages are translated
+    cache_vary_on = ('LANGUAGE_CODE',)
     text_enabled = True
     
     def render(self, context, instance, placeholder):
@@ -8,6 +8,9 @@ class PicturePlugin(CMSPluginBase):
     model = Picture
     name = _("Picture")
     render_template = "cms/plugins/picture.html"
+    cache = True
+    # links to pages are translated
+    cache_vary_on = ('LANGUAGE_CODE',)
     text_enabled = True
     
     def render(self, context, instance, placeholder):
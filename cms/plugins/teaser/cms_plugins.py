@@ -8,6 +8,9 @@ class TeaserPlugin(CMSPluginBase):
     model = Teaser
     name = _("Teaser")
     render_template = "cms/plugins/teaser.html"
+    cache = True
+    # links to pages are translated
+    cache_vary_on = ('LANGUAGE_CODE',)
     
     def render(self, context, instance, placeholder):
         if instance.url:
@@ -15,6 +15,9 @@ class TextPlugin(CMSPluginBase):
     name = _("Text")
     form = TextForm
     render_template = "cms/plugins/text.html"
+    cache = True
+    # embedded links to pages are translated
+    cache_vary_on = ('LANGUAGE_CODE',)
     change_form_template = "cms/plugins/text_plugin_change_form.html"
 
     def get_editor_widget(self, request, plugins):
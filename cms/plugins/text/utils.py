@@ -1,19 +1,32 @@
+from django.template.defaultfilters import force_escape
 from cms.models import CMSPlugin
+from cms.utils.plugins import downcast_plugins
 import re
 
 OBJ_TAG_RE = re.compile(u"\{\{ plugin_object (\d+) \}\}")
 OBJ_ADMIN_RE = re.compile(ur'<img [^>]*\bid="plugin_obj_(\d+)"[^>]*/?>')
 
+def get_plugins(ids):
+    """
+    Load plugins with given ids and their concrete instances with a constant
+    number of queries, return them in a dict by id.
+    """
+    if not ids:
+        return {}
+    plugins = list(CMSPlugin.objects.filter(pk__in=set(ids)))
+    downcast_plugins(plugins)
+    return dict([(plugin.pk, plugin) for plugin in plugins])
+
 def plugin_tags_to_admin_html(text):
     """
     Convert plugin object 'tags' into the form used to represent
     them in the admin text editor.
     """
+    plugins = get_plugins([int(plugin_id) for plugin_id in OBJ_TAG_RE.findall(text)])
     def _tag_to_admin(m):
         plugin_id = int(m.groups()[0])
-        try:
-            obj = CMSPlugin.objects.get(pk=plugin_id)
-        except CMSPlugin.DoesNotExist:
+        obj = plugins.get(plugin_id, None)
+        if obj is None:
             # Object must have been deleted.  It cannot be rendered to
             # end user, or edited, so just remove it from the HTML
             # altogether
@@ -32,11 +45,11 @@ def plugin_tags_to_user_html(text, context, placeholder):
 
     context is the template context to use, placeholder is the placeholder name
     """
+    plugins = get_plugins([int(plugin_id) for plugin_id in OBJ_ADMIN_RE.findall(text)])
     def _render_tag(m):
         plugin_id = int(m.groups()[0])
-        try:
-            obj = CMSPlugin.objects.get(pk=plugin_id)
-        except CMSPlugin.DoesNotExist:
+        obj = plugins.get(plugin_id, None)
+        if obj is None:
             # Object must have been deleted.  It cannot be rendered to
             # end user so just remove it from the HTML altogether
             return u''
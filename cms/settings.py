@@ -92,6 +92,24 @@ CMS_DEFAULT_LANGUAGE = getattr(settings, 'CMS_DEFAULT_LANGUAGE', settings.LANGUA
 # Defines how long page content should be cached, including navigation
 CMS_CONTENT_CACHE_DURATION = getattr(settings, 'CMS_CONTENT_CACHE_DURATION', 60)
 
+# Whether whole responses of cms pages should be cached for anonymous users.
+# Cache gets invalidated when some page gets published, moved or deleted.
+CMS_PAGE_CACHE = getattr(settings, 'CMS_PAGE_CACHE', False)
+
+# Upper limit for how long a page response stays in cache - required only for
+# changes which doesn't fire any signal, like CMS_SHOW_START_DATE
+CMS_PAGE_CACHE_DURATION = getattr(settings, 'CMS_PAGE_CACHE_DURATION', 60 * 60)
+
+# Answer conditional GET requests of anonymous visitors with 304 Not Modified
+CMS_PAGE_CONDITIONAL_GET = getattr(settings, 'CMS_PAGE_CONDITIONAL_GET', False)
+
+# Whether rendered html of menu tags should be cached. Cache gets invalidated
+# when some page or title changes.
+CMS_MENU_CACHE = getattr(settings, 'CMS_MENU_CACHE', False)
+
+# How many not found paths should be remembered per site, 0 turns it off
+CMS_NOT_FOUND_CACHE_SIZE = getattr(settings, 'CMS_NOT_FOUND_CACHE_SIZE', 1000)
+
 # The id of default Site instance to be used for multisite purposes.
 SITE_ID = getattr(settings, 'SITE_ID', 1)
 DEBUG = getattr(settings, 'DEBUG', False)
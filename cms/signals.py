@@ -3,6 +3,9 @@ from cms import settings as cms_settings, appresolver
 from cms.models import signals as cms_signals, Page, Title
 from cms.models import CMSPlugin        
 from cms.utils.moderator import page_changed
+from cms.utils.page import build_title_url, update_home_urls
+from cms.cache.home import get_home, clear_home_cache
+from cms.exceptions import NoHomeFound
 from django.core.exceptions import ObjectDoesNotExist
         
 def update_plugin_positions(**kwargs):
@@ -21,6 +24,9 @@ signals.post_delete.connect(update_plugin_positions, sender=CMSPlugin)
 def update_title_paths(instance, **kwargs):
     """Update child pages paths in case when page was moved.
     """
+    # move may change the home page, titles get their urls built against it
+    # before cache signals refresh it
+    clear_home_cache()
     for title in instance.title_set.all():
         title.save()
         
@@ -52,6 +58,12 @@ def pre_save_title(instance, raw, **kwargs):
             instance.path = (u'%s/%s' % (parent_path, slug)).lstrip("/")
         else:
             instance.path = u'%s' % slug
+    
+    try:
+        home = get_home(instance.page.site_id, instance.page.publisher_is_draft)
+    except NoHomeFound:
+        home = None
+    instance.url = build_title_url(instance, instance.page, home)
 
 signals.pre_save.connect(pre_save_title, sender=Title)
 
@@ -97,9 +109,15 @@ def clear_appresolver_cache(instance, **kwargs):
     appresolver.dynamic_app_regex_url_resolver.reset_cache()
 
 
+def post_delete_title(instance, **kwargs):
+    if instance.application_urls:
+        clear_appresolver_cache(instance)
+
+
 if cms_settings.CMS_APPLICATIONS_URLS:
     # register this signal only if we have some hookable applications
     cms_signals.application_post_changed.connect(clear_appresolver_cache, sender=Title)        
+    signals.post_delete.connect(post_delete_title, sender=Title)
 
 
 def post_save_user(instance, raw, created, **kwargs):
@@ -169,6 +187,23 @@ if cms_settings.CMS_PERMISSION:
     signals.post_save.connect(post_save_user_group, Group)
 
 
+def update_home_title_urls(instance, **kwargs):
+    """Home page is the first published root page, so it may be changed only
+    by changes of root pages and by moves. Urls of pages in its tree don't
+    contain home slug.
+    """
+    old_page = getattr(instance, 'old_page', None)
+    moved = kwargs.get('signal', None) is cms_signals.page_moved or (old_page is not None and
+        (old_page.parent_id, old_page.tree_id) != (instance.parent_id, instance.tree_id))
+    if instance.parent_id is None or moved:
+        update_home_urls(instance.site_id, instance.publisher_is_draft)
+
+signals.post_save.connect(update_home_title_urls, sender=Page)
+signals.post_delete.connect(update_home_title_urls, sender=Page)
+# after update_title_paths, so moved titles get fixed too
+cms_signals.page_moved.connect(update_home_title_urls, sender=Page)
+
+
 def pre_save_page(instance, raw, **kwargs):
     """Helper pre save signal, assigns old_page attribute, so we can still
     compare changes. Currently used only if CMS_PUBLISHER
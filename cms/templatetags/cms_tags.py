@@ -8,9 +8,17 @@ from cms.exceptions import NoHomeFound
 
 from cms import settings
 from cms.models import Page
-from cms.utils.moderator import get_cmsplugin_queryset, get_page_queryset, get_title_queryset
+from cms.utils.cmscontext import get_cms_context
+from cms.utils.navigation import get_page_node
+from cms.cache.language_urls import get_language_url
+from cms.cache.navigation import get_navigation_tree
+from cms.cache.breadcrumb import get_breadcrumb
+from cms.cache.menu import get_menu_cache_key, get_cached_menu, set_cached_menu
+from cms.cache.placeholder import get_placeholder_cache_key, get_cached_placeholder,\
+    set_cached_placeholder
 from cms.utils import get_language_from_request,\
-    get_extended_navigation_nodes, find_children, cut_levels, find_selected
+    get_extended_navigation_nodes, find_children, cut_levels, find_selected,\
+    walk_menu, index_children
 
 
 register = template.Library()
@@ -39,10 +47,11 @@ def show_menu(context, from_level=0, to_level=100, extra_inactive=0, extra_activ
         request = context['request']
     except KeyError:
         return {'template': 'cms/empty.html'}
-    page_queryset = get_page_queryset(request)
+    cms_context = get_cms_context(request)
+    page_queryset = cms_context.page_queryset
     
-    site = Site.objects.get_current()
-    lang = get_language_from_request(request)
+    site = cms_context.site
+    lang = cms_context.language
     current_page = request.current_page
     if current_page == "dummy":
         context.update({'children':[],
@@ -52,36 +61,39 @@ def show_menu(context, from_level=0, to_level=100, extra_inactive=0, extra_activ
                     'extra_inactive':extra_inactive,
                     'extra_active':extra_active})
         return context
+    if not next_page:
+        cache_key = get_menu_cache_key(request, "show_menu", (from_level, to_level, extra_inactive, extra_active, template, root_id),
+            levels=(to_level, root_id))
+        cached = get_cached_menu(cache_key)
+        if cached:
+            return cached
     if hasattr(current_page, "home_pk_cache"):
         home_pk = current_page.home_pk_cache
     else:
         try:
-            home_pk = page_queryset.get_home(site).pk
+            home_pk = cms_context.get_home().pk
         except NoHomeFound:
             home_pk = 0
     if not next_page: #new menu... get all the data so we can save a lot of queries
-        ids = []
+        tree = get_navigation_tree(site.pk, lang, cms_context.draft)
         children = []
         ancestors = []
         if current_page:
-            alist = current_page.get_ancestors().values_list('id', 'soft_root')
+            alist = tree.get_ancestors(current_page)
+            if alist is None:
+                alist = current_page.get_ancestors()
+            alist = [(p.pk, p.soft_root) for p in alist]
         else:# maybe the active node is in an extender?
             alist = []
-            extenders = page_queryset.published().filter(in_navigation=True, 
-                                                        site=site, 
-                                                        level__lte=to_level)
-            extenders = extenders.exclude(navigation_extenders__isnull=True).exclude( navigation_extenders__exact="")
-            for ext in extenders:
+            extenders = [p for p in tree.pages if p.navigation_extenders and p.level <= to_level]
+            for ext in tree.get_overlay(extenders):
                 ext.childrens = []
                 ext.ancestors_ascending = []
                 get_extended_navigation_nodes(request, 100, [ext], ext.level, 100, 100, False, ext.navigation_extenders)
                 if hasattr(ext, "ancestor"):
-                    alist = list(ext.get_ancestors().values_list('id', 'soft_root'))
+                    alist = [(p.pk, p.soft_root) for p in tree.get_ancestors(ext) or []]
                     alist = [(ext.pk, ext.soft_root)] + alist
                     break
-        filters = {'in_navigation' : True, 
-                   'site' : site,
-                   'level__lte' : to_level}
         #check the ancestors for softroots
         soft_root_pk = None
         for p in alist:
@@ -91,47 +103,43 @@ def show_menu(context, from_level=0, to_level=100, extra_inactive=0, extra_activ
         #modify filters if we don't start from the root
         root_page = None
         if root_id:
-            try:
-                root_page = page_queryset.get(reverse_id=root_id, site=site)
-            except:
-                send_missing_mail(root_id, request)
+            root_page = tree.get_page_by_reverse_id(root_id)
+            if root_page is None:
+                try:
+                    root_page = page_queryset.get(reverse_id=root_id, site=site)
+                except:
+                    send_missing_mail(root_id, request)
         else:
             if current_page and current_page.soft_root:
-                root_page = current_page
                 soft_root_pk = current_page.pk
-            elif soft_root_pk:
-                root_page = page_queryset.get(pk=soft_root_pk)
+            if soft_root_pk:
+                root_page = tree.get_page(soft_root_pk)
+                if root_page is None:
+                    root_page = page_queryset.get(pk=soft_root_pk)
         if root_page:
-            if isinstance(root_page, int):
-                root_page = page_queryset.get(pk=root_page)
             if isinstance(root_page, Page):
-                root_page = page_queryset.get(pk=root_page.id)
-            elif isinstance(root_page, unicode):
-                root_page = page_queryset.get(reverse_id=root_page, site=site)
-            filters['tree_id'] = root_page.tree_id
-            filters['lft__gt'] = root_page.lft
-            filters['rght__lt'] = root_page.rght
-            filters['level__lte'] = root_page.level + to_level
+                # unpublished root, not in the tree
+                root_page = get_page_node(root_page, lang)
+            else:
+                root_page = tree.get_overlay([root_page])[0]
+            max_level = root_page.level + to_level
+            pages = [p for p in tree.pages if p.tree_id == root_page.tree_id and
+                     root_page.lft < p.lft and p.rght < root_page.rght and p.level <= max_level]
             db_from_level = root_page.level + from_level
         else:
+            pages = [p for p in tree.pages if p.level <= to_level]
             db_from_level = from_level
-        if settings.CMS_HIDE_UNTRANSLATED:
-            filters['title_set__language'] = lang
-        pages = page_queryset.published().filter(**filters).order_by('tree_id', 
-                                                                    'parent', 
-                                                                    'lft')
-        
-        pages = list(pages)
+        pages = tree.get_overlay(pages)
         if root_page:
             pages = [root_page] + pages
         all_pages = pages[:]
         root_level = getattr(root_page, 'level', None)
+        children_index = index_children(pages)
         for page in pages:# build the tree
-            if page.level >= db_from_level:
-                ids.append(page.pk)
             if page.level == 0 or page.level == root_level:
                 if page.parent_id:
-                    page.get_cached_ancestors()
+                    # extenders mark ancestors, don't touch the cached ones
+                    page.ancestors_ascending = tree.get_overlay(tree.get_ancestors(page) or [])
                 else:
                     page.ancestors_ascending = []
                 page.home_pk_cache = home_pk
@@ -144,17 +152,12 @@ def show_menu(context, from_level=0, to_level=100, extra_inactive=0, extra_activ
                     pk = current_page.pk
                 else:
                     pk = -1
-                find_children(page, pages, extra_inactive, extra_active, ancestors, pk, request=request, to_levels=to_level)
+                find_children(page, pages, extra_inactive, extra_active, ancestors, pk, request=request, to_levels=to_level, children_index=children_index)
                 if page.pk == soft_root_pk:
                     page.soft_root = True
         if db_from_level > 0:
             children = cut_levels(children, db_from_level)
-        titles = list(get_title_queryset(request).filter(page__in=ids, language=lang))
-        for page in all_pages:# add the title and slugs and some meta data
-            for title in titles:
-                if title.page_id == page.pk:
-                    page.title_cache = title
-                    #titles.remove(title)
+        for page in all_pages:# add some meta data
             if page.pk in ancestors:
                 page.ancestor = True
             if current_page and page.parent_id == current_page.parent_id and not page.pk == current_page.pk:
@@ -167,10 +170,15 @@ def show_menu(context, from_level=0, to_level=100, extra_inactive=0, extra_activ
                     'to_level':to_level,
                     'extra_inactive':extra_inactive,
                     'extra_active':extra_active})
+    if not next_page:
+        return set_cached_menu(cache_key, context)
     return context
 show_menu = register.inclusion_tag('cms/dummy.html', takes_context=True)(show_menu)
 
 
+register.filter(walk_menu)
+
+
 def show_menu_below_id(context, root_id=None, from_level=0, to_level=100, extra_inactive=0, extra_active=100, template_file="cms/menu.html", next_page=None):
     return show_menu(context, from_level, to_level, extra_inactive, extra_active, template_file, next_page, root_id=root_id)
 register.inclusion_tag('cms/dummy.html', takes_context=True)(show_menu_below_id)
@@ -180,10 +188,10 @@ def show_sub_menu(context, levels=100, template="cms/sub_menu.html"):
     """Get the root page of the current page and 
     render a nested list of all root's children pages"""
     request = context['request']
-    page_queryset = get_page_queryset(request)
+    cms_context = get_cms_context(request)
     
-    lang = get_language_from_request(request)
-    site = Site.objects.get_current()
+    lang = cms_context.language
+    site = cms_context.site
     children = []
     page = request.current_page
     if page == "dummy":
@@ -195,29 +203,25 @@ def show_sub_menu(context, levels=100, template="cms/sub_menu.html"):
                         'extra_active':0
                         })
         return context
+    cache_key = get_menu_cache_key(request, "show_sub_menu", (levels, template))
+    cached = get_cached_menu(cache_key)
+    if cached:
+        return cached
     
+    tree = get_navigation_tree(site.pk, lang, cms_context.draft)
     if page:
         page.get_cached_ancestors()
         # this is not required anymore, sice home_pk_cache is a getter 
         #if not hasattr(page, "home_pk_cache"):
         #    page.home_pk_cache = page_queryset.get_home(site).pk
-        filters = {'in_navigation':True, 
-                  'lft__gt':page.lft, 
-                  'rght__lt':page.rght, 
-                  'tree_id':page.tree_id, 
-                  'level__lte':page.level+levels, 
-                  'site':site}
-        if settings.CMS_HIDE_UNTRANSLATED:
-            filters['title_set__language'] = lang
-        pages = page_queryset.published().filter(**filters)
-        ids = []
-        pages = list(pages)
-        all_pages = pages[:]
+        max_level = page.level + levels
+        pages = [p for p in tree.pages if p.tree_id == page.tree_id and
+                 page.lft < p.lft and p.rght < page.rght and p.level <= max_level]
+        pages = tree.get_overlay(pages)
         
         page.childrens = []
         for p in pages:
             p.descendant  = True
-            ids.append(p.pk)
         page.selected = True
         page.menu_level = -1
         was_soft_root = False
@@ -228,23 +232,17 @@ def show_sub_menu(context, levels=100, template="cms/sub_menu.html"):
         if was_soft_root:
             page.soft_root = True
         children = page.childrens
-        titles = get_title_queryset(request).filter(page__in=ids, language=lang)
-        for p in all_pages:# add the title and slugs and some meta data
-            for title in titles:
-                if title.page_id == p.pk:
-                    p.title_cache = title
         from_level = page.level
         to_level = page.level+levels
         extra_active = extra_inactive = levels
     else:
-        extenders = page_queryset.published().filter(in_navigation=True, site=site)
-        extenders = extenders.exclude(navigation_extenders__isnull=True).exclude(navigation_extenders__exact="")
+        extenders = [p for p in tree.pages if p.navigation_extenders]
         children = []
         from_level = 0
         to_level = 0
         extra_active = 0
         extra_inactive = 0
-        for ext in extenders:
+        for ext in tree.get_overlay(extenders):
             ext.childrens = []
             ext.ancestors_ascending = []
             nodes = get_extended_navigation_nodes(request, 100, [ext], ext.level, 100, levels, False, ext.navigation_extenders)
@@ -262,15 +260,14 @@ def show_sub_menu(context, levels=100, template="cms/sub_menu.html"):
                     'to_level':to_level,
                     'extra_inactive':extra_inactive,
                     'extra_active':extra_active})
-    return context
+    return set_cached_menu(cache_key, context)
 show_sub_menu = register.inclusion_tag('cms/dummy.html',
                                        takes_context=True)(show_sub_menu)
                                             
 
 def show_breadcrumb(context, start_level=0, template="cms/breadcrumb.html"):
     request = context['request']
-    page_queryset = get_page_queryset(request)
-    title_queryset = get_title_queryset(request) 
+    cms_context = get_cms_context(request)
     
     page = request.current_page
     if page == "dummy":
@@ -279,57 +276,29 @@ def show_breadcrumb(context, start_level=0, template="cms/breadcrumb.html"):
             'template': template,
         })
         return context
-    lang = get_language_from_request(request)
+    cache_key = get_menu_cache_key(request, "show_breadcrumb", (start_level, template))
+    cached = get_cached_menu(cache_key)
+    if cached:
+        return cached
+    lang = cms_context.language
     if page:
-        ancestors = list(page.get_ancestors())
-        ancestors.append(page)
-        home = page_queryset.get_home()
-        if ancestors and ancestors[0].pk != home.pk: 
-            ancestors = [home] + ancestors
-        ids = [page.pk]
-        for anc in ancestors:
-            ids.append(anc.pk)
-        titles = title_queryset.filter(page__in=ids, language=lang)
-        for anc in ancestors:
-            anc.home_pk_cache = home.pk 
-            for title in titles:
-                if title.page_id == anc.pk:
-                    anc.title_cache = title
-        for title in titles:
-            if title.page_id == page.pk:
-                page.title_cache = title
+        ancestors = get_breadcrumb(page, lang)
     else:
-        site = Site.objects.get_current()
+        site = cms_context.site
         ancestors = []
-        extenders = page_queryset.published().filter(in_navigation=True, site=site)
-        extenders = extenders.exclude(navigation_extenders__isnull=True).exclude(navigation_extenders__exact="")
-        for ext in extenders:
+        tree = get_navigation_tree(site.pk, lang, cms_context.draft)
+        extenders = [p for p in tree.pages if p.navigation_extenders]
+        for ext in tree.get_overlay(extenders):
             ext.childrens = []
             ext.ancestors_ascending = []
             nodes = get_extended_navigation_nodes(request, 100, [ext], ext.level, 100, 0, False, ext.navigation_extenders)
             if hasattr(ext, "ancestor"):
                 selected = find_selected(nodes)
                 if selected:
-                    ancestors = list(ext.get_ancestors()) + [ext]
-                    home = page_queryset.get_home()
-                    if ancestors and ancestors[0].pk != home.pk: 
-                        ancestors = [home] + ancestors
-                    ids = []
-                    for anc in ancestors:
-                        ids.append(anc.pk)
-                    titles = title_queryset.filter(page__in=ids, language=lang)
-                    ancs = []
-                    for anc in ancestors:
-                        anc.home_pk_cache = home.pk
-                        anc.ancestors_ascending = ancs[:]
-                        ancs += [anc]
-                        for title in titles:
-                            if title.page_id == anc.pk:
-                                anc.title_cache = title
-                    ancestors = ancestors + selected.ancestors_ascending[1:] + [selected]
+                    ancestors = get_breadcrumb(ext, lang, cms_context.draft) + selected.ancestors_ascending[1:] + [selected]
     context.update({'ancestors':ancestors,
                     'template': template})
-    return context
+    return set_cached_menu(cache_key, context)
 show_breadcrumb = register.inclusion_tag('cms/dummy.html',
                                          takes_context=True)(show_breadcrumb)
 
@@ -361,13 +330,14 @@ def page_id_url(context, reverse_id, lang=None, site=None):
     if request.current_page == "dummy":
         return {'content': ''}
     
+    cms_context = get_cms_context(request)
     if lang is None:
-        lang = get_language_from_request(request)
+        lang = cms_context.language
     key = 'page_id_url_pid:'+str(reverse_id)+'_l:'+str(lang)+'_site:'+str(site_id)+'_type:absolute_url'
     url = cache.get(key)
     if not url:
         try:
-            page = get_page_queryset(request).get(reverse_id=reverse_id,site=site_id)
+            page = cms_context.page_queryset.get(reverse_id=reverse_id,site=site_id)
             url = page.get_absolute_url(language=lang)
             cache.set(key, url, settings.CMS_CONTENT_CACHE_DURATION)
         except:
@@ -395,9 +365,12 @@ def page_language_url(context, lang):
     if hasattr(request, "_language_changer"):
         url = "/%s" % lang + request._language_changer(lang)
     else:
-        try:
-            url = "/%s" % lang + page.get_absolute_url(language=lang, fallback=not settings.CMS_HIDE_UNTRANSLATED)
-        except:
+        path = None
+        if page:
+            path = get_language_url(page, lang, fallback=not settings.CMS_HIDE_UNTRANSLATED)
+        if path:
+            url = "/%s" % lang + path
+        else:
             url = "/%s/" % lang 
     if url:
         return {'content':url}
@@ -452,23 +425,37 @@ class PlaceholderNode(template.Node):
     def render(self, context):
         if not 'request' in context:
             return ''
-        l = get_language_from_request(context['request'])
         request = context['request']
+        cms_context = get_cms_context(request)
+        l = cms_context.language
         
         page = request.current_page
         if page == "dummy":
             return ""
-        plugins = get_cmsplugin_queryset(request).filter(page=page, language=l, placeholder__iexact=self.name, parent__isnull=True).order_by('position').select_related()
+        if page:
+            plugins = cms_context.get_placeholder_plugins(page, l, self.name)
+        else:
+            plugins = []
         if settings.CMS_PLACEHOLDER_CONF and self.name in settings.CMS_PLACEHOLDER_CONF:
             if "extra_context" in settings.CMS_PLACEHOLDER_CONF[self.name]:
                 context.update(settings.CMS_PLACEHOLDER_CONF[self.name]["extra_context"])
         if self.theme:
             # this may overwrite previously defined key [theme] from settings.CMS_PLACEHOLDER_CONF
             context.update({'theme': self.theme,})
-        c = ""
-        for plugin in plugins:
-            c += plugin.render_plugin(context, self.name)
-        return c
+        if not plugins:
+            return ""
+        key = get_placeholder_cache_key(context, page, l, cms_context.draft, self.name, plugins)
+        content = get_cached_placeholder(key)
+        if content is not None:
+            return mark_safe(content)
+        # plugins which can't be cached mark the context
+        outer_uncacheable = getattr(context, 'uncacheable_plugin', False)
+        context.uncacheable_plugin = False
+        content = u"".join([plugin.render_plugin(context, self.name) for plugin in plugins])
+        if not context.uncacheable_plugin:
+            set_cached_placeholder(key, self.name, content)
+        context.uncacheable_plugin = outer_uncacheable or context.uncacheable_plugin
+        return mark_safe(content)
         
     def __repr__(self):
         return "<Placeholder Node: %s>" % self.name
@@ -504,8 +491,8 @@ class PageAttributeNode(template.Node):
     def render(self, context):
         if not 'request' in context:
             return ''
-        lang = get_language_from_request(context['request'])
         request = context['request']
+        lang = get_cms_context(request).language
         page = request.current_page
         if page == "dummy":
             return ''
@@ -545,13 +532,14 @@ def show_placeholder_by_id(context, placeholder_name, reverse_id, lang=None, sit
     
     if not request:
         return {'content':''}
+    cms_context = get_cms_context(request)
     if lang is None:
-        lang = get_language_from_request(request)
+        lang = cms_context.language
     key = 'show_placeholder_by_id_pid:'+reverse_id+'_placeholder:'+placeholder_name+'_site:'+str(site_id)+'_l:'+str(lang)
     content = cache.get(key)
     if not content:
         try:
-            page = get_page_queryset(request).get(reverse_id=reverse_id, site=site_id)
+            page = cms_context.page_queryset.get(reverse_id=reverse_id, site=site_id)
         except:
             if settings.DEBUG:
                 raise
@@ -565,10 +553,8 @@ def show_placeholder_by_id(context, placeholder_name, reverse_id, lang=None, sit
                           settings.MANAGERS,
                           fail_silently=True)
                 return {'content':''}
-        plugins = get_cmsplugin_queryset(request).filter(page=page, language=lang, placeholder__iexact=placeholder_name, parent__isnull=True).order_by('position').select_related()
-        content = ""
-        for plugin in plugins:
-            content += plugin.render_plugin(context, placeholder_name)
+        plugins = cms_context.get_placeholder_plugins(page, lang, placeholder_name)
+        content = u"".join([plugin.render_plugin(context, placeholder_name) for plugin in plugins])
 
     cache.set(key, content, settings.CMS_CONTENT_CACHE_DURATION)
 
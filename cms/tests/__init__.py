@@ -6,6 +6,9 @@ import doctest
 from cms.utils import urlutils
 from cms.tests.page import PagesTestCase
 from cms.tests.permmod import PermissionModeratorTestCase
+from cms.tests.cache import CacheTestCase
+from cms.tests.navigation import NavigationTestCase
+from cms.tests.sitemap import SitemapTestCase
 from cms import settings as cms_settings
 
 def suite():
@@ -13,6 +16,9 @@ def suite():
     s = unittest.TestSuite()
     s.addTest(doctest.DocTestSuite(urlutils))
     s.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(PagesTestCase))
+    s.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(CacheTestCase))
+    s.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(NavigationTestCase))
+    s.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(SitemapTestCase))
     
     if cms_settings.CMS_PERMISSION and cms_settings.CMS_MODERATOR:
         s.addTest(unittest.defaultTestLoader.loadTestsFromTestCase(PermissionModeratorTestCase))
@@ -1,4 +1,6 @@
 from django.test.testcases import TestCase
+from django.contrib.auth.models import User
+from cms.models import Title, Page
 
 URL_CMS_PAGE = "/admin/cms/page/"
 URL_CMS_PAGE_ADD = URL_CMS_PAGE + "add/"
@@ -22,3 +24,35 @@ class PageBaseTestCase(TestCase):
         
         self.counter = self.counter + 1
         return page_data
+
+
+class CMSTestCase(PageBaseTestCase):
+    """Logged in superuser, who creates published pages over admin.
+    """
+    def setUp(self):
+        u = User(username="test")
+        u.set_password("test")
+        u.is_staff = True
+        u.is_active = True
+        u.is_superuser = True
+        u.save()
+        self.login_user(u)
+
+    def get_new_page_data(self):
+        page_data = super(CMSTestCase, self).get_new_page_data()
+        page_data['published'] = True
+        page_data['pagepermission_set-TOTAL_FORMS'] = 0
+        page_data['pagepermission_set-INITIAL_FORMS'] = 0
+        return page_data
+
+    def create_page(self, parent_page=None, page_data=None):
+        page_data = page_data or self.get_new_page_data()
+        url = URL_CMS_PAGE_ADD
+        if parent_page:
+            url += "?target=%d&position=first-child" % parent_page.pk
+        response = self.client.post(url, page_data)
+        self.assertRedirects(response, URL_CMS_PAGE)
+        page = Title.objects.drafts().get(slug=page_data['slug']).page
+        # titles are added after the page, so publish again
+        page.save()
+        return Page.objects.drafts().get(pk=page.pk)
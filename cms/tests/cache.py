@@ -0,0 +1,606 @@
+# -*- coding: utf-8 -*-
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from cms.models import Title, Page
+from cms.tests.base import CMSTestCase, URL_CMS_PAGE
+from cms.cache.routing import get_page_ids, get_page_slug
+
+
+class CacheTestCase(CMSTestCase):
+    """Caches used in frontend must follow changes made in admin.
+    """
+    def add_plugin(self, page, plugin_type, position=0, parent=None, model=None, **fields):
+        """Adds plugin to content placeholder the same way plugin admin does,
+        returns its concrete instance if model is given, base plugin otherwise.
+        Plugins of public pages are public.
+        """
+        from cms.models import CMSPlugin
+        plugin = CMSPlugin(page=page, language='en', plugin_type=plugin_type,
+            placeholder='content', position=position, parent=parent,
+            publisher_is_draft=page.publisher_is_draft)
+        plugin.save()
+        if model is None:
+            return plugin
+        instance = model(**fields)
+        plugin.set_base_attr(instance)
+        instance.publisher_is_draft = plugin.publisher_is_draft
+        instance.pk = plugin.pk
+        instance.cmsplugin_ptr = plugin
+        instance.save()
+        return instance
+
+    def test_01_routing_index(self):
+        home = self.create_page()
+        child_data = self.get_new_page_data()
+        child = self.create_page(home, child_data)
+        public_home = Page.objects.public().get(pk=home.publisher_public_id)
+
+        lookup = lambda path: get_page_ids(1, False, path, 'en',
+            public_home.get_slug(), public_home.tree_id)
+        self.assertEqual(lookup(child_data['slug']), [child.publisher_public_id])
+        # home page isn't reachable over its slug
+        self.assertEqual(lookup(public_home.get_slug()), [])
+
+        response = self.client.get("/en/%s/" % child_data["slug"])
+        self.assertEqual(response.status_code, 200)
+
+        # changed slug must be reflected in index
+        child_data['slug'] = 'changed-slug'
+        response = self.client.post(URL_CMS_PAGE + "%d/" % child.pk, child_data)
+        self.assertRedirects(response, URL_CMS_PAGE)
+        self.assertEqual(lookup('test-page-2'), [])
+        self.assertEqual(lookup('changed-slug'), [child.publisher_public_id])
+        self.assertEqual(get_page_slug(1, False, public_home.pk, 'en'), public_home.get_slug())
+        # untranslated pages fall back to the latest slug
+        self.assertEqual(get_page_slug(1, False, public_home.pk, 'de'), public_home.get_slug())
+
+    def test_02_page_cache(self):
+        from cms import settings as cms_settings
+        from cms.cache.page import get_cached_response
+        home = self.create_page()
+        child_data = self.get_new_page_data()
+        child = self.create_page(home, child_data)
+        url = "/en/%s/" % child_data['slug']
+        request = HttpRequest()
+        # multilingual middleware strips the language prefix
+        request.path = "/%s/" % child_data['slug']
+
+        cms_settings.CMS_PAGE_CACHE = True
+        try:
+            # staff users don't get cached responses
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(get_cached_response(request, 'en'), None)
+
+            self.client.logout()
+            # unknown query parameters bypass the cache
+            response = self.client.get(url, {'utm_source': 'test'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(get_cached_response(request, 'en'), None)
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(get_cached_response(request, 'en'), None)
+            self.assertEqual(self.client.get(url).content, response.content)
+
+            # publishing invalidates the cache
+            self.login_user(User.objects.get(username="test"))
+            child_data['title'] = 'changed title'
+            response = self.client.post(URL_CMS_PAGE + "%d/" % child.pk, child_data)
+            self.assertRedirects(response, URL_CMS_PAGE)
+            self.assertEqual(get_cached_response(request, 'en'), None)
+        finally:
+            cms_settings.CMS_PAGE_CACHE = False
+
+    def test_03_application_urlpatterns(self):
+        from cms.appresolver import dynamic_app_regex_url_resolver
+        home = self.create_page()
+        child_data = self.get_new_page_data()
+        child = self.create_page(home, child_data)
+        urlconf = dynamic_app_regex_url_resolver.urlconf_module
+        self.assertEqual(urlconf.urlpatterns, [])
+
+        title = Title.objects.public().get(page=child.publisher_public_id)
+        title.application_urls = 'sampleapp.urls'
+        title.save()
+        self.assertEqual([p.page_id for p in urlconf.urlpatterns], [title.page_id])
+        
+        find_page_id = dynamic_app_regex_url_resolver.find_page_id
+        self.assertEqual(find_page_id(title.path + "/"), title.page_id)
+        self.assertEqual(find_page_id(title.path + "/sublevel/"), title.page_id)
+        # application doesn't handle this one
+        self.assertEqual(find_page_id(title.path + "/unknown/"), None)
+        self.assertEqual(find_page_id("unknown/sublevel/"), None)
+        
+        title.delete()
+        self.assertEqual(urlconf.urlpatterns, [])
+
+    def test_04_request_context(self):
+        from cms.utils.cmscontext import get_cms_context
+        home = self.create_page()
+        request = HttpRequest()
+        request.user = User.objects.get(username="test")
+        request.LANGUAGE_CODE = 'en'
+        request.REQUEST = {}
+        cms_context = get_cms_context(request)
+        self.assertTrue(get_cms_context(request) is cms_context)
+        self.assertEqual(cms_context.language, 'en')
+        self.assertEqual(cms_context.draft, False)
+        self.assertTrue(cms_context.page_queryset is cms_context.page_queryset)
+        self.assertEqual(cms_context.get_home().pk, home.publisher_public_id)
+        self.assertTrue(cms_context.get_home() is cms_context.get_home())
+
+    def test_05_home_registry(self):
+        from cms.cache.home import get_home_pk
+        from cms.exceptions import NoHomeFound
+        self.assertRaises(NoHomeFound, get_home_pk, 1, True)
+        home = self.create_page()
+        self.assertEqual(get_home_pk(1, True), home.pk)
+        self.assertEqual(get_home_pk(1, False), home.publisher_public_id)
+        self.assertEqual(Page.objects.get(pk=home.pk).home_pk_cache, home.pk)
+        
+        # unpublished page can't be home
+        home.published = False
+        home.save()
+        self.assertRaises(NoHomeFound, get_home_pk, 1, True)
+
+    def test_06_conditional_get(self):
+        from cms import settings as cms_settings
+        home = self.create_page()
+        child_data = self.get_new_page_data()
+        child = self.create_page(home, child_data)
+        url = "/en/%s/" % child_data['slug']
+        
+        cms_settings.CMS_PAGE_CONDITIONAL_GET = True
+        try:
+            # staff users don't get validators
+            response = self.client.get(url)
+            self.assertFalse(response.has_header('ETag'))
+            
+            self.client.logout()
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            etag, last_modified = response['ETag'], response['Last-Modified']
+            
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], etag)
+            response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            self.assertEqual(response.status_code, 304)
+            response = self.client.get(url, HTTP_IF_NONE_MATCH='"other"')
+            self.assertEqual(response.status_code, 200)
+            
+            # published change makes the page modified
+            self.login_user(User.objects.get(username="test"))
+            child_data['title'] = 'changed title'
+            response = self.client.post(URL_CMS_PAGE + "%d/" % child.pk, child_data)
+            self.assertRedirects(response, URL_CMS_PAGE)
+            self.client.logout()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+        finally:
+            cms_settings.CMS_PAGE_CONDITIONAL_GET = False
+            # page saves in other tests need logged in user in thread locals
+            self.login_user(User.objects.get(username="test"))
+            self.client.get(url)
+
+    def test_07_language_urls(self):
+        from cms.cache.language_urls import get_language_urls, get_language_url
+        home = self.create_page()
+        child_data = self.get_new_page_data()
+        child = self.create_page(home, child_data)
+        public_child = Page.objects.public().get(pk=child.publisher_public_id)
+        url = public_child.get_absolute_url(language='en')
+        
+        self.assertEqual(get_language_urls(public_child)['en'], (url, True))
+        self.assertEqual(get_language_urls(public_child)['de'], (url, False))
+        self.assertEqual(get_language_url(public_child, 'de', fallback=False), None)
+        
+        # new translation gets its own url
+        child_data['language'] = 'de'
+        child_data['slug'] = 'german-slug'
+        response = self.client.post(URL_CMS_PAGE + "%d/" % child.pk, child_data)
+        self.assertRedirects(response, URL_CMS_PAGE)
+        public_child = Page.objects.public().get(pk=child.publisher_public_id)
+        de_url = get_language_url(public_child, 'de', fallback=False)
+        self.assertNotEqual(de_url, url)
+        self.assertEqual(de_url, public_child.get_absolute_url(language='de', fallback=False))
+
+    def test_08_not_found_cache(self):
+        from cms import settings as cms_settings
+        from cms.cache.notfound import is_missing, set_missing
+        from django.http import Http404
+        from cms.views import details
+        self.create_page()
+        page_data = self.get_new_page_data()
+        request = HttpRequest()
+        request.user = User.objects.get(username="test")
+        request.LANGUAGE_CODE = 'en'
+        request.REQUEST = {}
+        self.assertRaises(Http404, details, request, slug=page_data['slug'])
+        self.assertTrue(is_missing(1, False, 'en', page_data['slug']))
+        
+        # new page makes the path resolvable
+        self.create_page(page_data=page_data)
+        self.assertFalse(is_missing(1, False, 'en', page_data['slug']))
+        response = self.client.get("/en/%s/" % page_data['slug'])
+        self.assertEqual(response.status_code, 200)
+        
+        size = cms_settings.CMS_NOT_FOUND_CACHE_SIZE
+        cms_settings.CMS_NOT_FOUND_CACHE_SIZE = 2
+        try:
+            for path in ('a', 'b', 'c'):
+                set_missing(1, False, 'en', path)
+            self.assertEqual([is_missing(1, False, 'en', path) for path in ('a', 'b', 'c')],
+                [False, True, True])
+        finally:
+            cms_settings.CMS_NOT_FOUND_CACHE_SIZE = size
+
+    def test_09_identity_map(self):
+        from cms.utils.identity import IdentityMap, set_identity_map
+        home = self.create_page()
+        child = self.create_page(home)
+        set_identity_map(IdentityMap())
+        try:
+            first, second = Page.objects.get(pk=child.pk), Page.objects.get(pk=child.pk)
+            self.assertTrue(first.get_title_obj('en') is second.get_title_obj('en'))
+            self.assertTrue(first.get_cached_ancestors() is second.get_cached_ancestors())
+            self.assertEqual([p.pk for p in first.get_cached_ancestors()], [home.pk])
+            self.assertEqual(first.get_title_obj('de', fallback=True).language, 'en')
+            self.assertRaises(Title.DoesNotExist, second.get_title_obj, 'de', fallback=False)
+            
+            # changes aren't hidden by the map
+            title = first.get_title_obj('en')
+            title.title = 'changed title'
+            title.save()
+            self.assertEqual(Page.objects.get(pk=child.pk).get_title('en'), 'changed title')
+            
+            # unsignalled changes are picked up by force_reload and shared
+            Title.objects.filter(pk=title.pk).update(title='updated title')
+            self.assertEqual(first.get_title('en'), 'changed title')
+            self.assertEqual(first.get_title('en', force_reload=True), 'updated title')
+            self.assertEqual(Page.objects.get(pk=child.pk).get_title('en'), 'updated title')
+        finally:
+            set_identity_map(None)
+
+    def test_10_with_titles(self):
+        home = self.create_page()
+        child = self.create_page(home)
+        pages = list(Page.objects.drafts().with_titles('en').order_by('tree_id', 'lft'))
+        self.assertEqual([p.pk for p in pages], [home.pk, child.pk])
+        self.assertEqual([p.title_cache.language for p in pages], ['en', 'en'])
+        self.assertEqual(pages[1].languages_cache, ['en'])
+        
+        # falls back to existing title, if allowed
+        pages = list(Page.objects.drafts().filter(pk=child.pk).with_titles('de'))
+        self.assertEqual(pages[0].title_cache.language, 'en')
+        pages = list(Page.objects.drafts().filter(pk=child.pk).with_titles('de', fallback=False))
+        self.assertEqual(pages[0].title_cache, None)
+        
+        # pages outside of navigation tree get menu nodes with single query
+        from django.conf import settings
+        from django.db import connection
+        from cms.utils.navigation import get_page_node
+        page = Page.objects.get(pk=child.pk)
+        debug = settings.DEBUG
+        settings.DEBUG = True
+        connection.queries = []
+        try:
+            node = get_page_node(page, 'en')
+            queries = len(connection.queries)
+        finally:
+            settings.DEBUG = debug
+        self.assertEqual(queries, 1)
+        self.assertEqual((node.title, node.languages), (page.get_title('en'), ['en']))
+    
+    def test_11_navigation_tree(self):
+        from cms.cache.navigation import get_navigation_tree
+        home_data = self.get_new_page_data()
+        home_data['in_navigation'] = True
+        home = self.create_page(page_data=home_data)
+        child_data = self.get_new_page_data()
+        child_data['in_navigation'] = True
+        child = self.create_page(home, child_data)
+        
+        tree = get_navigation_tree(1, 'en', False)
+        self.assertEqual([p.pk for p in tree.pages], [home.publisher_public_id, child.publisher_public_id])
+        self.assertEqual(tree.pages[1].get_absolute_url(), "/%s/" % child_data['slug'])
+        self.assertEqual(get_navigation_tree(1, 'en', False), tree)
+        
+        response = self.client.get("/en/%s/" % child_data["slug"])
+        self.assertEqual(response.status_code, 200)
+        # menu flags are set on copies only
+        self.assertEqual([p for p in tree.pages if hasattr(p, 'selected')], [])
+        self.assertEqual(get_navigation_tree(1, 'en', False), tree)
+        
+        child_data['slug'] = 'changed-slug'
+        response = self.client.post(URL_CMS_PAGE + "%d/" % child.pk, child_data)
+        self.assertRedirects(response, URL_CMS_PAGE)
+        tree = get_navigation_tree(1, 'en', False)
+        self.assertEqual(tree.pages[1].get_absolute_url(), "/changed-slug/")
+    
+    def test_12_menu_cache(self):
+        from cms import settings as cms_settings
+        from cms.cache import navigation
+        home_data = self.get_new_page_data()
+        home_data['in_navigation'] = True
+        home = self.create_page(page_data=home_data)
+        child_data = self.get_new_page_data()
+        child_data['in_navigation'] = True
+        child = self.create_page(home, child_data)
+        url = "/en/%s/" % child_data['slug']
+        
+        cms_settings.CMS_MENU_CACHE = True
+        try:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            # changes without signals aren't visible in cached menus
+            Title.objects.filter(page__in=[child.pk, child.publisher_public_id]).update(menu_title="changed menu")
+            navigation._trees.clear()
+            self.assertNotContains(self.client.get(url), ">changed menu</a>")
+            
+            navigation.clear_navigation_cache()
+            self.assertContains(self.client.get(url), ">changed menu</a>")
+        finally:
+            cms_settings.CMS_MENU_CACHE = False
+    
+    def test_13_breadcrumb(self):
+        from cms.cache.breadcrumb import get_breadcrumb, _trails
+        home = self.create_page()
+        child = self.create_page(home)
+        grandchild_data = self.get_new_page_data()
+        grandchild = self.create_page(child, grandchild_data)
+        other = self.create_page()
+        other_child = self.create_page(other)
+        
+        trail = get_breadcrumb(grandchild, 'en')
+        self.assertEqual([p.pk for p in trail], [home.pk, child.pk, grandchild.pk])
+        # home slug isn't part of urls
+        self.assertEqual(trail[-1].get_absolute_url(), "/%s/%s/" % (child.get_slug(), grandchild.get_slug()))
+        self.assertEqual(trail[1].get_menu_title(), child.get_menu_title())
+        # home is added to trails in other trees
+        trail = get_breadcrumb(other_child, 'en')
+        self.assertEqual([p.pk for p in trail], [home.pk, other.pk, other_child.pk])
+        self.assertEqual(trail[-1].get_absolute_url(), "/%s/%s/" % (other.get_slug(), other_child.get_slug()))
+        
+        # trails are cached, but callers get copies
+        trail[0].ancestor = True
+        self.assertTrue((other_child.pk, 'en') in _trails[True][1])
+        self.assertFalse(hasattr(get_breadcrumb(other_child, 'en')[0], 'ancestor'))
+        
+        grandchild_data['title'] = 'changed title'
+        response = self.client.post(URL_CMS_PAGE + "%d/" % grandchild.pk, grandchild_data)
+        self.assertRedirects(response, URL_CMS_PAGE)
+        grandchild = Page.objects.get(pk=grandchild.pk)
+        self.assertEqual(get_breadcrumb(grandchild, 'en')[-1].get_title(), 'changed title')
+
+    def test_14_placeholder_plugins(self):
+        from cms.models import CMSPlugin
+        from cms.utils.cmscontext import get_cms_context
+        page = self.create_page().publisher_public
+        def add_plugin(placeholder, position):
+            plugin = CMSPlugin(page=page, language='en', plugin_type='TextPlugin',
+                placeholder=placeholder, position=position, publisher_is_draft=False)
+            plugin.save()
+            return plugin.pk
+        second, first, left = add_plugin('content', 1), add_plugin('Content', 0), add_plugin('left_column', 0)
+        request = HttpRequest()
+        request.user = User.objects.get(username="test")
+        request.LANGUAGE_CODE = 'en'
+        request.REQUEST = request.GET = {}
+        cms_context = get_cms_context(request)
+        plugins = cms_context.get_placeholder_plugins(page, 'en', 'content')
+        self.assertEqual([p.pk for p in plugins], [first, second])
+        
+        # all placeholders of the page were loaded at once
+        add_plugin('left_column', 1)
+        plugins = cms_context.get_placeholder_plugins(page, 'en', 'Left_Column')
+        self.assertEqual([p.pk for p in plugins], [left])
+        self.assertEqual(cms_context.get_placeholder_plugins(page, 'en', 'footer'), [])
+        self.assertEqual(cms_context.get_placeholder_plugins(page, 'de', 'content'), [])
+
+    def test_15_downcast_plugins(self):
+        from cms.models import CMSPlugin
+        from cms.plugins.text.models import Text
+        from cms.utils.plugins import downcast_plugins
+        page = self.create_page()
+        self.add_plugin(page, 'TextPlugin', 0, model=Text, body='first')
+        self.add_plugin(page, 'TextPlugin', 1, model=Text, body='second')
+        # concrete row is missing
+        self.add_plugin(page, 'TextPlugin', 2)
+        plugins = list(CMSPlugin.objects.filter(page=page).order_by('position'))
+        instances = downcast_plugins(plugins)
+        self.assertEqual([i.body for i in instances], ['first', 'second'])
+        self.assertTrue(plugins[1].get_plugin_instance()[0] is instances[1])
+        self.assertEqual(plugins[2].get_plugin_instance()[0], None)
+        self.assertEqual(plugins[0].render_plugin(placeholder='content').strip(), 'first')
+
+    def test_16_plugin_render_cache(self):
+        from django.template import Context
+        from cms.models import CMSPlugin
+        from cms.plugins.text.models import Text
+        from cms.plugins.snippet.models import Snippet, SnippetPtr
+        draft_page = self.create_page()
+        page = draft_page.publisher_public
+        other_page = self.create_page().publisher_public
+        text = self.add_plugin(page, 'TextPlugin', model=Text, body='first')
+        render = lambda: CMSPlugin.objects.get(pk=text.pk).render_plugin(Context(), 'content').strip()
+        self.assertEqual(render(), 'first')
+        # changes without signals aren't visible
+        Text.objects.filter(pk=text.pk).update(body='changed')
+        self.assertEqual(render(), 'first')
+        # neither are saves of drafts and plugins of other pages
+        draft = self.add_plugin(draft_page, 'TextPlugin', model=Text, body='draft')
+        self.add_plugin(other_page, 'TextPlugin', model=Text, body='other')
+        self.assertEqual(render(), 'first')
+        text = Text.objects.get(pk=text.pk)
+        text.save()
+        self.assertEqual(render(), 'changed')
+        
+        # drafts are always rendered with moderator
+        draft_render = lambda: CMSPlugin.objects.get(pk=draft.pk).render_plugin(Context(), 'content').strip()
+        self.assertEqual(draft_render(), 'draft')
+        Text.objects.filter(pk=draft.pk).update(body='changed draft')
+        self.assertEqual(draft_render(), 'changed draft')
+        
+        # text with snippet isn't cached
+        snippet = Snippet.objects.create(name='snippet', html='snippet')
+        child = self.add_plugin(page, 'SnippetPlugin', parent=CMSPlugin.objects.get(pk=text.pk),
+            model=SnippetPtr, snippet=snippet)
+        text.body = '<img id="plugin_obj_%d"/>' % child.pk
+        text.save()
+        self.assertEqual(render(), 'snippet')
+        Snippet.objects.filter(pk=snippet.pk).update(html='changed snippet')
+        self.assertEqual(render(), 'changed snippet')
+
+    def test_17_placeholder_cache(self):
+        from django.core.cache import cache
+        from django.template import Template, Context
+        from cms import settings as cms_settings
+        from cms.cache.placeholder import get_placeholder_cache_key
+        from cms.plugins.text.models import Text
+        from cms.plugins.snippet.models import Snippet, SnippetPtr
+        from cms.utils.cmscontext import get_cms_context
+        page = self.create_page().publisher_public
+        first = self.add_plugin(page, 'TextPlugin', 0, model=Text, body='first')
+        self.add_plugin(page, 'TextPlugin', 1, model=Text, body='second')
+        def render():
+            """Returns rendered placeholder and its cached html.
+            """
+            request = HttpRequest()
+            request.user = User.objects.get(username="test")
+            request.LANGUAGE_CODE = 'en'
+            request.REQUEST = request.GET = {}
+            request.current_page = page
+            template = Template('{% load cms_tags %}{% placeholder "content" %}')
+            content = template.render(Context({'request': request}))
+            cms_context = get_cms_context(request)
+            self.assertFalse(cms_context.draft)
+            plugins = cms_context.get_placeholder_plugins(page, 'en', 'content')
+            key = get_placeholder_cache_key(Context({'request': request}), page, 'en',
+                cms_context.draft, 'content', plugins)
+            return content.replace("\n", ""), key and cache.get(key).replace("\n", "")
+        self.assertEqual(render(), ('firstsecond', 'firstsecond'))
+        
+        # opt-out
+        placeholder_conf = cms_settings.CMS_PLACEHOLDER_CONF
+        cms_settings.CMS_PLACEHOLDER_CONF = {'content': {'cache': False}}
+        try:
+            self.assertEqual(render(), ('firstsecond', None))
+        finally:
+            cms_settings.CMS_PLACEHOLDER_CONF = placeholder_conf
+        
+        # plugin move
+        first.position = 2
+        first.save()
+        self.assertEqual(render(), ('secondfirst', 'secondfirst'))
+        
+        # placeholder with plugin which can't be cached
+        snippet = Snippet.objects.create(name='snippet', html='snippet')
+        self.add_plugin(page, 'SnippetPlugin', 3, model=SnippetPtr, snippet=snippet)
+        self.assertEqual(render(), ('secondfirstsnippet', None))
+        Snippet.objects.filter(pk=snippet.pk).update(html='changed snippet')
+        self.assertEqual(render()[0], 'secondfirstchanged snippet')
+
+    def test_18_embedded_plugins(self):
+        from django.conf import settings
+        from django.db import connection
+        from django.template import Context
+        from cms.models import CMSPlugin
+        from cms.plugins.link.models import Link
+        from cms.plugins.text.models import Text
+        from cms.plugins.text.utils import plugin_tags_to_user_html,\
+            plugin_tags_to_admin_html, plugin_admin_html_to_tags
+        page = self.create_page()
+        text = self.add_plugin(page, 'TextPlugin', model=Text, body='')
+        parent = CMSPlugin.objects.get(pk=text.pk)
+        links = [self.add_plugin(page, 'LinkPlugin', i, parent=parent, model=Link,
+            name='link %d' % i, url='http://example.com/%d/' % i) for i in range(5)]
+        body = "".join(['<img id="plugin_obj_%d"/>' % link.pk for link in links])
+        # deleted plugins are removed
+        body += '<img id="plugin_obj_%d"/>' % (links[-1].pk + 1)
+        def count_queries(func, *args):
+            debug = settings.DEBUG
+            settings.DEBUG = True
+            connection.queries = []
+            try:
+                result = func(*args)
+                return result, len(connection.queries)
+            finally:
+                settings.DEBUG = debug
+        # each plugin type is downcasted with one query
+        html, queries = count_queries(plugin_tags_to_user_html, body, Context(), 'content')
+        self.assertEqual(queries, 2)
+        self.assertEqual(html.count('<a href="http://example.com/'), 5)
+        tags = plugin_admin_html_to_tags(body)
+        html, queries = count_queries(plugin_tags_to_admin_html, tags)
+        self.assertEqual(queries, 2)
+        self.assertEqual(html.count('<img src='), 5)
+
+    def test_19_lru_dict(self):
+        from cms.cache.lru import LRUDict
+        d = LRUDict(4)
+        for i in range(4):
+            d[i] = str(i)
+        # 0 is used, so 1 is the least recently used one
+        self.assertEqual(d[0], '0')
+        d[4] = '4'
+        self.assertEqual(len(d), 4)
+        self.assertFalse(1 in d)
+        self.assertEqual(d.get(0), '0')
+        self.assertEqual(d.get(1, 'missing'), 'missing')
+
+    def test_20_routing_queries(self):
+        from django.conf import settings
+        from django.db import connection
+        from django.contrib.auth.models import AnonymousUser
+        from cms.views import details
+        home = self.create_page()
+        child_data = self.get_new_page_data()
+        self.create_page(home, child_data)
+        def get_page():
+            request = HttpRequest()
+            request.user = AnonymousUser()
+            request.LANGUAGE_CODE = 'en'
+            request.REQUEST = request.GET = {}
+            request.path = "/%s/" % child_data['slug']
+            return details(request, slug=child_data['slug'], only_context=True)['current_page']
+        self.assertEqual(get_page().get_slug(), child_data['slug'])
+        debug = settings.DEBUG
+        settings.DEBUG = True
+        connection.queries = []
+        try:
+            get_page()
+            queries = len(connection.queries)
+        finally:
+            settings.DEBUG = debug
+        # home and its slug come from memory, only the page and its title
+        # are loaded
+        self.assertEqual(queries, 2)
+
+    def test_21_menu_branch_keys(self):
+        from cms import settings as cms_settings
+        from cms.cache.menu import get_menu_cache_key
+        pages = []
+        for parent in (None, 0, 1, 1):
+            page_data = self.get_new_page_data()
+            page_data['in_navigation'] = True
+            parent = parent is not None and pages[parent] or None
+            pages.append(self.create_page(parent, page_data))
+        home, child, first, second = [page.publisher_public for page in pages]
+        def get_key(page, to_level):
+            request = HttpRequest()
+            request.user = User.objects.get(username="test")
+            request.LANGUAGE_CODE = 'en'
+            request.REQUEST = request.GET = {}
+            request.current_page = page
+            return get_menu_cache_key(request, "show_menu", (to_level,), levels=(to_level, None))
+        cms_settings.CMS_MENU_CACHE = True
+        try:
+            # siblings below rendered levels render the same menu
+            self.assertEqual(get_key(first, 1), get_key(second, 1))
+            self.assertNotEqual(get_key(first, 1), get_key(child, 1))
+            # selected page is part of the menu
+            self.assertNotEqual(get_key(first, 2), get_key(second, 2))
+        finally:
+            cms_settings.CMS_MENU_CACHE = False
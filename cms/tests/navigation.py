@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+from django.test.testcases import TestCase
+from django.template import Context
+from django.template.loader import render_to_string
+from django.dispatch import Signal
+from cms.utils import walk_menu, find_children, index_children, make_tree,\
+    cut_levels
+from cms.utils.navigation import NavigationNode
+from cms.extender_pool import ExtenderPool, cached_extender
+
+
+class Node(object):
+    def __init__(self, title, childrens=None):
+        self.title = title
+        self.childrens = childrens or []
+    
+    def get_menu_title(self):
+        return self.title
+    
+    def get_absolute_url(self):
+        return "/%s/" % self.title
+
+
+class PageNode(object):
+    soft_root = False
+    navigation_extenders = None
+    home_pk_cache = 1
+    
+    def __init__(self, pk, parent_id=None, level=0):
+        self.pk, self.parent_id, self.level = pk, parent_id, level
+
+
+nodes_changed = Signal()
+extender_calls = []
+
+@cached_extender(60, ((nodes_changed, None),))
+def get_test_nodes(request):
+    extender_calls.append(request)
+    return [Node("a", [Node("aa")])]
+
+
+class NavigationTestCase(TestCase):
+    """Menu tree building and rendering helpers.
+    """
+    def get_tree(self):
+        return [
+            Node("a", [
+                Node("aa", [Node("aaa")]),
+                Node("ab"),
+            ]),
+            Node("b"),
+        ]
+    
+    def test_01_walk_menu(self):
+        entries = walk_menu(self.get_tree())
+        self.assertEqual([(e.node.title, e.level, e.has_children, e.closed_levels) for e in entries], [
+            ("a", 0, True, []),
+            ("aa", 1, True, []),
+            ("aaa", 2, False, [1]),
+            ("ab", 1, False, [0]),
+            ("b", 0, False, []),
+        ])
+        self.assertEqual(walk_menu([]), [])
+    
+    def test_02_flat_menu_template(self):
+        content = render_to_string("cms/menu_flat.html", Context({'children': self.get_tree()}))
+        self.assertEqual(content.count("<li"), 5)
+        self.assertEqual(content.count("</li>"), 5)
+        self.assertEqual(content.count("<ul>"), 2)
+        self.assertEqual(content.count("</ul>"), 2)
+        # nested in the same order as nodes
+        positions = [content.index('href="/%s/"' % t) for t in ("a", "aa", "aaa", "ab", "b")]
+        self.assertEqual(positions, sorted(positions))
+
+    def get_pages(self):
+        root = PageNode(1)
+        root.ancestors_ascending = []
+        return [root, PageNode(2, 1, 1), PageNode(3, 2, 2), PageNode(4, 1, 1), PageNode(5, 4, 2)]
+    
+    def test_03_find_children(self):
+        pages = self.get_pages()
+        root = pages[0]
+        self.assertEqual(sorted(index_children(pages).keys()), [1, 2, 4])
+        
+        find_children(root, pages, 100, 100, [1, 2], 3)
+        self.assertEqual([p.pk for p in root.childrens], [2, 4])
+        self.assertEqual([p.last for p in root.childrens], [False, True])
+        self.assertEqual([p.pk for p in root.childrens[0].childrens], [3])
+        self.assertEqual([p.pk for p in pages[2].ancestors_ascending], [1, 2])
+        self.assertTrue(pages[1].ancestor and pages[2].selected)
+        self.assertFalse(hasattr(pages[3], 'ancestor'))
+        
+        # levels limit inactive branches
+        pages = self.get_pages()
+        root = pages[0]
+        find_children(root, pages, 1, 100, [], -1)
+        self.assertEqual([p.pk for p in root.childrens], [2, 4])
+        self.assertEqual(pages[1].childrens, [])
+
+    def test_04_cached_extender(self):
+        pool = ExtenderPool()
+        path = "cms.tests.navigation.get_test_nodes"
+        del extender_calls[:]
+        nodes = pool.get_nodes(None, path, "en")
+        nodes[0].selected = True
+        nodes[0].childrens[0].level = 2
+        
+        # next request gets clean copies
+        nodes = pool.get_nodes(None, path, "en")
+        self.assertEqual(len(extender_calls), 1)
+        self.assertFalse(hasattr(nodes[0], "selected"))
+        self.assertFalse(hasattr(nodes[0].childrens[0], "level"))
+        self.assertEqual(nodes[0].childrens[0].title, "aa")
+        
+        pool.get_nodes(None, path, "de")
+        self.assertEqual(len(extender_calls), 2)
+        
+        nodes_changed.send(sender=None)
+        pool.get_nodes(None, path, "en")
+        self.assertEqual(len(extender_calls), 3)
+
+    def test_05_navigation_nodes(self):
+        node = NavigationNode("a", "/a/", childrens=[NavigationNode("aa", "/a/aa/", menu_title="AA")])
+        self.assertEqual(node.childrens[0].get_menu_title(), "AA")
+        self.assertFalse(hasattr(node, "selected"))
+        self.assertRaises(AttributeError, setattr, node, "unknown", True)
+        copy = node.copy()
+        self.assertEqual((copy.title, copy.url), ("a", "/a/"))
+        self.assertFalse(hasattr(copy, "childrens"))
+        
+        # extenders may return them
+        make_tree(None, [node], 100, "/a/aa/", [])
+        child = node.childrens[0]
+        self.assertEqual((node.level, child.level), (1, 2))
+        self.assertTrue(node.ancestor and child.selected)
+        self.assertEqual(child.ancestors_ascending, [node])
+        self.assertEqual(cut_levels([node], 2), [child])
+        content = render_to_string("cms/menu_flat.html", Context({'children': [node]}))
+        self.assertEqual(content.count('href="/a/aa/"'), 1)
+
+    def test_06_broken_extender(self):
+        import warnings
+        from cms import settings as cms_settings
+        extenders = cms_settings.CMS_NAVIGATION_EXTENDERS
+        cms_settings.CMS_NAVIGATION_EXTENDERS = (
+            ("cms.tests.missing_module.get_nodes", "Missing"),
+            ("cms.tests.navigation.get_test_nodes", "Test"),
+        )
+        warnings.simplefilter("ignore")
+        try:
+            pool = ExtenderPool()
+            pool.discover_extenders()
+            self.assertEqual(pool.extenders.keys(), ["cms.tests.navigation.get_test_nodes"])
+            self.assertRaises(ImportError, pool.get_extender, "cms.tests.missing_module.get_nodes")
+        finally:
+            warnings.resetwarnings()
+            cms_settings.CMS_NAVIGATION_EXTENDERS = extenders
@@ -258,3 +258,53 @@ class PagesTestCase(PageBaseTestCase):
         self.assertEqual(response.status_code, 200)
         response = self.client.get("/admin/cms/page/%s/" % pk, {"language":"de" })
         self.assertEqual(response.status_code, 200)
+    
+    def test_11_title_urls(self):
+        """
+        Test that title urls are materialized and follow home page changes
+        """
+        self.client.login(username= 'test', password='test')
+        setattr(settings, "SITE_ID", 1)
+        pages = []
+        for target in (None, 0, 1, None, 3):
+            page_data = self.get_new_page_data()
+            url = '/admin/cms/page/add/'
+            if target is not None:
+                url += '?target=%d&position=first-child' % pages[target].pk
+            self.client.post(url, page_data)
+            pages.append(Title.objects.drafts().get(slug=page_data['slug']).page)
+        home, child, grandchild, root, root_child = pages
+        
+        def get_urls():
+            titles = Title.objects.drafts().filter(page__in=pages)
+            urls = dict(titles.values_list('page', 'url'))
+            return [urls[page.pk] for page in pages]
+        
+        self.assertEqual(get_urls(), [u'', u'test-page-2/', u'test-page-2/test-page-3/',
+            u'test-page-4/', u'test-page-4/test-page-5/'])
+        grandchild = Page.objects.get(pk=grandchild.pk)
+        self.assertEqual(grandchild.get_absolute_url(), '/test-page-2/test-page-3/')
+        
+        # the other root page becomes home
+        home = Page.objects.get(pk=home.pk)
+        home.published = False
+        home.save()
+        self.assertEqual(get_urls(), [u'test-page-1/', u'test-page-1/test-page-2/',
+            u'test-page-1/test-page-2/test-page-3/', u'', u'test-page-5/'])
+        root_child = Page.objects.get(pk=root_child.pk)
+        self.assertEqual(root_child.get_absolute_url(), '/test-page-5/')
+        
+        # home moved into the other tree, which becomes home tree; drafts
+        # only, publisher can't publish under unpublished parents
+        moderator = cms_settings.CMS_MODERATOR
+        cms_settings.CMS_MODERATOR = False
+        try:
+            home.published = True
+            home.save()
+            response = self.client.post('/admin/cms/page/%d/move-page/' % home.pk,
+                {'position': 'first-child', 'target': root_child.pk})
+            self.assertEqual(response.status_code, 200)
+        finally:
+            cms_settings.CMS_MODERATOR = moderator
+        self.assertEqual(get_urls(), [u'test-page-5/test-page-1/', u'test-page-5/test-page-1/test-page-2/',
+            u'test-page-5/test-page-1/test-page-2/test-page-3/', u'', u'test-page-5/'])
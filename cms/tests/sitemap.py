@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import zlib
+from django.contrib.auth.models import User
+from django.http import HttpRequest
+from cms.tests.base import CMSTestCase
+from cms.utils import sitemap as sitemap_utils
+from cms.views import sitemap
+
+
+class SitemapTestCase(CMSTestCase):
+    """Sitemap of published pages.
+    """
+    def get_sitemap(self, path, section=None, compress=False):
+        request = HttpRequest()
+        request.path = path
+        request.user = User.objects.get(username="test")
+        response = sitemap(request, section, compress)
+        self.assertEqual(response.status_code, 200)
+        content = "".join(response)
+        if compress:
+            content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+        return content
+
+    def test_01_sitemap(self):
+        home = self.create_page()
+        child = self.create_page(home)
+        grandchild = self.create_page(child)
+
+        content = self.get_sitemap("/sitemap.xml")
+        self.assertTrue(content.startswith('<?xml'))
+        self.assertEqual(content.count("<url>"), 3)
+        # home slug isn't part of urls
+        for url in ("/en/", "/en/%s/" % child.get_slug(), "/en/%s/%s/" % (child.get_slug(), grandchild.get_slug())):
+            self.assertTrue("<loc>http://example.com%s</loc>" % url in content, url)
+        self.assertEqual(self.get_sitemap("/sitemap.xml.gz", compress=True), content)
+
+    def test_02_sitemap_index(self):
+        home = self.create_page()
+        self.create_page(home)
+        self.create_page(home)
+        max_urls = sitemap_utils.MAX_URLS
+        sitemap_utils.MAX_URLS = 2 * len(sitemap_utils.settings.CMS_LANGUAGES)
+        try:
+            content = self.get_sitemap("/sitemap.xml")
+            self.assertTrue("<sitemapindex" in content)
+            self.assertTrue("<loc>http://example.com/sitemap-2.xml</loc>" in content)
+            self.assertFalse("sitemap-3.xml" in content)
+
+            sections = [self.get_sitemap("/sitemap-%d.xml" % i, i) for i in (1, 2)]
+            self.assertEqual([s.count("<url>") for s in sections], [2, 1])
+        finally:
+            sitemap_utils.MAX_URLS = max_urls
+
+    def test_03_sitemap_command(self):
+        import os, shutil, tempfile
+        from django.core.management import call_command
+        home = self.create_page()
+        self.create_page(home)
+        directory = tempfile.mkdtemp()
+        try:
+            call_command('cms_sitemap', directory, 'http://example.com/')
+            content = open(os.path.join(directory, "sitemap.xml")).read()
+            self.assertEqual(content, self.get_sitemap("/sitemap.xml"))
+        finally:
+            shutil.rmtree(directory)
@@ -97,6 +97,7 @@ def make_tree(request, items, levels, url, ancestors, descendants=False, current
     """
     builds the tree of all the navigation extender nodes and marks them with some metadata
     """
+    from cms.utils.navigation import is_page_node
     levels -= 1
     current_level += 1
     found = False
@@ -112,11 +113,11 @@ def make_tree(request, items, levels, url, ancestors, descendants=False, current
             found = True
             last = None
             for anc in ancestors:
-                if not isinstance(anc, Page) and last:
+                if not is_page_node(anc) and last:
                     last = None
                     if hasattr(last, 'childrens'):
                         for child in last.childrens:
-                            if isinstance(child, Page):
+                            if is_page_node(child):
                                 child.sibling = True
                 else:
                     last = anc
@@ -124,7 +125,7 @@ def make_tree(request, items, levels, url, ancestors, descendants=False, current
             if last:
                 if hasattr(last, 'childrens'):
                     for child in last.childrens:
-                        if isinstance(child, Page):
+                        if is_page_node(child):
                             child.sibling = True
         elif found:
             item.sibling = True
@@ -141,10 +142,9 @@ def get_extended_navigation_nodes(request, levels, ancestors, current_level, to_
     """
     discovers all navigation nodes from navigation extenders
     """    
-    func_name = path.split(".")[-1]
-    ext = __import__(".".join(path.split(".")[:-1]),(),(),(func_name,))
-    func = getattr(ext, func_name)
-    items = func(request)
+    from cms.extender_pool import extender_pool
+    from cms.utils.cmscontext import get_cms_context
+    items = extender_pool.get_nodes(request, path, get_cms_context(request).language)
     descendants = False
     for anc in ancestors:
         if hasattr(anc, 'selected'):
@@ -159,14 +159,29 @@ def get_extended_navigation_nodes(request, levels, ancestors, current_level, to_
                 item.sibling = True
     return items
     
-def find_children(target, pages, levels=100, active_levels=0, ancestors=None, selected_pk=0, soft_roots=True, request=None, no_extended=False, to_levels=100):
+def index_children(pages):
+    """
+    Returns {parent_id: [page, ...]} for given pages, children keep their order
+    """
+    children_index = {}
+    for page in pages:
+        if page.parent_id:
+            children_index.setdefault(page.parent_id, []).append(page)
+    return children_index
+
+def find_children(target, pages, levels=100, active_levels=0, ancestors=None, selected_pk=0, soft_roots=True, request=None, no_extended=False, to_levels=100, children_index=None):
     """
     recursive function for marking all children and handling the active and inactive trees with the level limits
+    
+    Pages are indexed by parent (see index_children) unless the index is given, 
+    so pass it when calling this for more roots from the same pages.
     """
     if not hasattr(target, "childrens"):
         target.childrens = []
     if ancestors == None:
         ancestors = []
+    if children_index is None:
+        children_index = index_children(pages)
     if target.pk in ancestors:
         target.ancestor = True
     if target.pk == selected_pk:
@@ -175,28 +190,33 @@ def find_children(target, pages, levels=100, active_levels=0, ancestors=None, se
     if (levels <= 0 or (target.soft_root and soft_roots)) and not target.pk in ancestors:
         return
     mark_sibling = False 
-    for page in pages:
-        if page.parent_id and page.parent_id == target.pk:
-            if hasattr(target, "selected") or hasattr(target, "descendant"):
-                page.descendant = True
-            if len(target.childrens):
-                target.childrens[-1].last = False
-            page.ancestors_ascending = list(target.ancestors_ascending) + [target]
-            page.home_pk_cache = target.home_pk_cache
-            page.last = True
-            target.childrens.append(page)    
-            find_children(page, 
-                          pages, 
-                          levels-1, 
-                          active_levels, 
-                          ancestors, 
-                          selected_pk, 
-                          soft_roots, 
-                          request, 
-                          no_extended,
-                          to_levels)
-            if hasattr(page, "selected"):
-                mark_sibling = True
+    children = children_index.get(target.pk, ())
+    if children:
+        # all the children share the same list, it doesn't get changed
+        children_ancestors = list(target.ancestors_ascending) + [target]
+        descendant = hasattr(target, "selected") or hasattr(target, "descendant")
+    for page in children:
+        if descendant:
+            page.descendant = True
+        if len(target.childrens):
+            target.childrens[-1].last = False
+        page.ancestors_ascending = children_ancestors
+        page.home_pk_cache = target.home_pk_cache
+        page.last = True
+        target.childrens.append(page)    
+        find_children(page, 
+                      pages, 
+                      levels-1, 
+                      active_levels, 
+                      ancestors, 
+                      selected_pk, 
+                      soft_roots, 
+                      request, 
+                      no_extended,
+                      to_levels,
+                      children_index)
+        if hasattr(page, "selected"):
+            mark_sibling = True
     if target.navigation_extenders and (levels > 0 or target.pk in ancestors) and not no_extended and target.level < to_levels: 
         target.childrens += get_extended_navigation_nodes(request, 
                                                           levels, 
@@ -219,6 +239,40 @@ def cut_levels(nodes, level):
         result += cut_levels(node.childrens, level)
     return result
 
+class MenuEntry(object):
+    """Single node in flat menu walk, see walk_menu.
+    """
+    def __init__(self, node, level):
+        self.node = node
+        self.level = level
+        self.has_children = False
+        # one item for each sub level closed after this node
+        self.closed_levels = []
+
+def walk_menu(nodes):
+    """
+    Walks prepared menu tree iteratively and returns flat list of MenuEntry, 
+    in the order in which they are rendered. Lets single template render 
+    nested menu without including itself for each sub level.
+    """
+    entries = []
+    stack = [iter(nodes)]
+    while stack:
+        try:
+            node = stack[-1].next()
+        except StopIteration:
+            stack.pop()
+            if stack:
+                entries[-1].closed_levels.append(len(stack) - 1)
+            continue
+        entry = MenuEntry(node, len(stack) - 1)
+        entries.append(entry)
+        childrens = getattr(node, 'childrens', None)
+        if childrens:
+            entry.has_children = True
+            stack.append(iter(childrens))
+    return entries
+
 def find_selected(nodes):
     """
     Finds a selected nav_extender node 
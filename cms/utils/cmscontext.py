@@ -0,0 +1,95 @@
+"""Request scoped cms context, available as request.cms.
+
+Holds values which are required many times during single page render (view,
+menus, placeholders, ...), computes each of them once on first access.
+"""
+from django.contrib.sites.models import Site
+from cms.exceptions import NoHomeFound
+from cms.cache.home import get_home
+from cms.utils.identity import IdentityMap
+from cms.utils import get_language_from_request
+from cms.utils.plugins import downcast_plugins
+from cms.utils.moderator import use_draft, get_page_queryset,\
+    get_title_queryset, get_cmsplugin_queryset
+
+
+class CMSContext(object):
+    def __init__(self, request):
+        self.request = request
+        self.identity_map = IdentityMap()
+        self._cache = {}
+
+    def _get(self, name, func, *args):
+        if not name in self._cache:
+            self._cache[name] = func(*args)
+        return self._cache[name]
+
+    @property
+    def language(self):
+        return self._get('language', get_language_from_request, self.request)
+
+    @property
+    def site(self):
+        return self._get('site', Site.objects.get_current)
+
+    @property
+    def draft(self):
+        return self._get('draft', use_draft, self.request)
+
+    # querysets get cloned on each filter, so they can be shared
+    @property
+    def page_queryset(self):
+        return self._get('page_queryset', get_page_queryset, self.request)
+
+    @property
+    def title_queryset(self):
+        return self._get('title_queryset', get_title_queryset, self.request)
+
+    @property
+    def cmsplugin_queryset(self):
+        return self._get('cmsplugin_queryset', get_cmsplugin_queryset, self.request)
+
+    def get_plugin_generations(self, page_id):
+        from cms.cache.plugins import get_plugin_generations
+        return self._get(('plugin_generations', page_id), get_plugin_generations, page_id)
+
+    def get_placeholder_plugins(self, page, language, placeholder):
+        """Top level plugins of given placeholder, ordered by position. All
+        placeholders of the page are loaded with single query on first call.
+        """
+        key = ('placeholders', page.pk, language)
+        if not key in self._cache:
+            self._cache[key] = self._load_placeholders(page, language)
+        return self._cache[key].get(placeholder.lower(), [])
+
+    def _load_placeholders(self, page, language):
+        plugins = list(self.cmsplugin_queryset.filter(page=page, language=language,
+            parent__isnull=True).order_by('position').select_related())
+        downcast_plugins(plugins)
+        placeholders = {}
+        for plugin in plugins:
+            placeholders.setdefault(plugin.placeholder.lower(), []).append(plugin)
+        return placeholders
+
+    def get_home(self):
+        """Home page of current site, raises NoHomeFound if there isn't any.
+        """
+        home = self._get('home', self._find_home)
+        if home is None:
+            raise NoHomeFound('No Root page found. Publish at least on page!')
+        return home
+
+    def _find_home(self):
+        try:
+            return get_home(self.site.pk, self.draft)
+        except NoHomeFound:
+            return None
+
+
+def get_cms_context(request):
+    """Returns cms context of given request, creates it if there isn't any
+    (CurrentPageMiddleware isn't installed, or request was created by hand).
+    """
+    if not hasattr(request, 'cms'):
+        request.cms = CMSContext(request)
+    return request.cms
@@ -0,0 +1,101 @@
+"""Request scoped identity map for pages and titles.
+
+The same page or title row is often required by many Page instances during
+single render - current page, menu nodes, breadcrumb, links in plugins. Map is
+created for each request by CurrentPageMiddleware and models look into it
+over thread locals, so any row gets loaded just once per request. It gets
+cleared whenever some page or title is changed (see cms.cache.signals).
+"""
+try:
+    from threading import local
+except ImportError:
+    from django.utils._threading_local import local
+
+_thread_locals = local()
+
+
+class IdentityMap(object):
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        # {pk: Page}
+        self.pages = {}
+        # {(page_id, language): Title or None}, language None for fallback
+        self.titles = {}
+        # {page_id: [Page, ...]} ascending
+        self.ancestors = {}
+
+    def add_pages(self, pages):
+        """Registers loaded pages, returns list of registered instances, which
+        are the already loaded ones where there are some.
+        """
+        return [self.pages.setdefault(page.pk, page) for page in pages]
+
+    def add_titles(self, titles, page_ids=(), language=None):
+        """Registers loaded titles. If page_ids and language are given, pages
+        without title in loaded set are marked as not translated.
+        """
+        for title in titles:
+            self.titles[(title.page_id, title.language)] = title
+        for page_id in page_ids:
+            self.titles.setdefault((page_id, language), None)
+
+    def get_title(self, page, language, fallback=False, reload=False):
+        """Returns title of page in given language, latest title if it isn't
+        translated and fallback is allowed, None otherwise. Same as
+        Title.objects.get_title does, but only once for each page, unless
+        reload is set.
+        """
+        from cms.models.titlemodels import Title
+        key = (page.pk, language)
+        if reload:
+            self.titles.pop(key, None)
+            self.titles.pop((page.pk, None), None)
+        if not key in self.titles:
+            try:
+                self.titles[key] = Title.objects.get_title(page, language)
+            except Title.DoesNotExist:
+                self.titles[key] = None
+        title = self.titles[key]
+        if title is None and fallback:
+            key = (page.pk, None)
+            if not key in self.titles:
+                self.titles[key] = Title.objects.get_title(page, language, language_fallback=True)
+            title = self.titles[key]
+        return title
+
+    def get_ancestors(self, page):
+        """Returns list of page ancestors, ascending. Taken from ancestors of
+        parent if they are known, loaded from db otherwise.
+        """
+        self.pages.setdefault(page.pk, page)
+        if not page.pk in self.ancestors:
+            parent = self.pages.get(page.parent_id, None)
+            if not page.parent_id:
+                ancestors = []
+            elif parent and parent.pk in self.ancestors:
+                ancestors = self.ancestors[parent.pk] + [parent]
+            else:
+                ancestors = self.add_pages(page.get_ancestors())
+            self.ancestors[page.pk] = ancestors
+        return self.ancestors[page.pk]
+
+
+def set_identity_map(identity_map):
+    """Activates identity map for current thread, None deactivates it.
+    """
+    _thread_locals.identity_map = identity_map
+
+def get_identity_map():
+    """Returns identity map of current request, or None.
+    """
+    return getattr(_thread_locals, 'identity_map', None)
+
+def clear_identity_map():
+    """Forgets everything loaded in current request, called when some page or
+    title changes.
+    """
+    identity_map = get_identity_map()
+    if identity_map:
+        identity_map.clear()
@@ -191,13 +191,19 @@ def approve_page(request, page):
         PageModeratorState(user=request.user, page=page, action=PageModeratorState.ACTION_APPROVE).save() 
 
 
+def use_draft(request=None):
+    """Decision function used in frontend - says if draft or public instances
+    should be used. Public models are used only if CMS_MODERATOR.
+    """
+    return not cms_settings.CMS_MODERATOR or \
+        bool(request and 'preview' in request.GET and 
+            'draft' in request.GET and request.user.is_staff)
+
 def get_model_queryset(model, request=None):
-    """Decision function used in frontend - says which model should be used. 
-    Public models are used only if CMS_MODERATOR.
+    """Returns draft or public queryset for given model, depending on 
+    use_draft.
     """
-    if not cms_settings.CMS_MODERATOR or \
-        (request and 'preview' in request.GET and 
-            'draft' in request.GET and request.user.is_staff):
+    if use_draft(request):
         return model.objects.drafts()
     
     return model.objects.public()
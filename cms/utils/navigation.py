@@ -0,0 +1,92 @@
+"""Compact menu nodes.
+
+Menus used to be built from full Page instances, with menu attributes added
+at runtime. NavigationNode holds just what menus need, in slots, and is cheap
+to create and to copy. Navigation extenders may return NavigationNodes too,
+anything with get_menu_title, get_absolute_url and childrens still works.
+
+Menu attributes follow the old protocol - selected, ancestor, sibling,
+descendant, last and menu_level are set only on nodes they apply to, so
+templates and hasattr checks keep working.
+"""
+
+class NavigationNode(object):
+    __slots__ = (
+        # node data
+        'pk', 'parent_id', 'tree_id', 'lft', 'rght', 'level', 'soft_root',
+        'reverse_id', 'navigation_extenders', 'title', 'menu_title', 'url',
+        'languages', 'is_page',
+        # menu attributes
+        'childrens', 'ancestors_ascending', 'home_pk_cache', 'menu_level',
+        'selected', 'ancestor', 'sibling', 'descendant', 'last',
+    )
+    # copied by copy(), the others are assigned during menu building
+    DATA_SLOTS = __slots__[:14]
+
+    def __init__(self, title, url, menu_title=None, childrens=None, pk=None,
+                 parent_id=None, level=0, is_page=False):
+        self.title = title
+        self.url = url
+        self.menu_title = menu_title
+        self.childrens = childrens or []
+        self.pk = pk
+        self.parent_id = parent_id
+        self.level = level
+        self.is_page = is_page
+        self.tree_id = self.lft = self.rght = None
+        self.soft_root = False
+        self.reverse_id = self.navigation_extenders = None
+        self.languages = []
+
+    def copy(self):
+        """Returns new node with the same data, but without menu attributes.
+        """
+        node = NavigationNode.__new__(NavigationNode)
+        for name in self.DATA_SLOTS:
+            setattr(node, name, getattr(self, name))
+        return node
+
+    def get_title(self, language=None, fallback=True):
+        return self.title
+
+    def get_menu_title(self, language=None, fallback=True):
+        return self.menu_title or self.title
+
+    def get_absolute_url(self, language=None, fallback=True):
+        return self.url
+
+    def get_languages(self):
+        return self.languages
+
+    def is_leaf_node(self):
+        if self.lft is not None:
+            return self.rght - self.lft == 1
+        return not getattr(self, 'childrens', None)
+
+    def __repr__(self):
+        return "<NavigationNode: %s>" % self.url
+
+
+def is_page_node(node):
+    """Is given menu node a cms page (not a node of navigation extender)?
+    """
+    from cms.models import Page
+    return isinstance(node, Page) or (isinstance(node, NavigationNode) and node.is_page)
+
+def get_page_node(page, language=None):
+    """NavigationNode for given Page instance, used for pages which aren't in
+    the navigation tree. Titles and languages of the page are loaded with
+    single query.
+    """
+    from cms.models.query import attach_titles
+    if language is not None:
+        attach_titles([page], language)
+    node = NavigationNode(page.get_title(language), page.get_absolute_url(language),
+        menu_title=page.get_menu_title(language), pk=page.pk,
+        parent_id=page.parent_id, level=page.level, is_page=True)
+    node.tree_id, node.lft, node.rght = page.tree_id, page.lft, page.rght
+    node.soft_root = page.soft_root
+    node.reverse_id = page.reverse_id
+    node.navigation_extenders = page.navigation_extenders
+    node.languages = page.get_languages()
+    return node
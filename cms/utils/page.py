@@ -1,5 +1,7 @@
+from django.db.models import Q
 from cms import settings as cms_settings
 from cms.exceptions import NoHomeFound
+from cms.utils.urlutils import urljoin
 
 APPEND_TO_SLUG = "_copy"
 
@@ -35,4 +37,49 @@ def get_available_slug(title, new_slug=None):
     slug = new_slug or title.slug
     if is_valid_page_slug(title.page, title.page.parent, title.language, slug, title.page.site_id):
         return title.slug
-    return get_available_slug(title, title.slug + APPEND_TO_SLUG)
\ No newline at end of file
+    return get_available_slug(title, title.slug + APPEND_TO_SLUG)
+
+def build_title_url(title, page, home):
+    """Returns url of title relative to pages root, it's materialized in
+    Title.url and used by Page.get_absolute_url. Home is the home page of
+    page's site and publisher state or None, urls of pages in its tree don't
+    contain home slug.
+    """
+    if home is not None and page.pk == home.pk:
+        return u''
+    if cms_settings.CMS_FLAT_URLS:
+        path = title.slug
+    else:
+        path = title.path
+        if page.parent_id and home is not None and page.tree_id == home.tree_id \
+            and not title.has_url_overwrite:
+            path = "/".join(path.split("/")[1:])
+    if not path:
+        return u''
+    return urljoin(path)
+
+def update_title_urls(titles, home):
+    """Builds urls of given titles again, changed ones are updated without
+    sending any signals.
+    """
+    from cms.models import Title
+    for title in titles.select_related('page'):
+        url = build_title_url(title, title.page, home)
+        if url != title.url:
+            Title.objects.filter(pk=title.pk).update(url=url)
+
+def update_home_urls(site_id, draft):
+    """Titles of the home page have empty url. If some other title has it, or
+    home titles don't, home page was changed, so urls in trees of the old and
+    the new home page are built again.
+    """
+    from cms.models import Title
+    from cms.cache.home import find_home
+    home = find_home(site_id, draft)
+    titles = Title.objects.filter(page__site=site_id, page__publisher_is_draft=draft)
+    stale = titles.filter(url='')
+    if home is not None:
+        stale = titles.filter((Q(url='') & ~Q(page=home)) | (Q(page=home) & ~Q(url='')))
+    tree_ids = set(stale.values_list('page__tree_id', flat=True))
+    if tree_ids:
+        update_title_urls(titles.filter(page__tree_id__in=tree_ids), home)
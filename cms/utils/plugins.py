@@ -0,0 +1,31 @@
+def downcast_plugins(plugins):
+    """Loads concrete instances (Text, Picture, ...) of given CMSPlugin rows,
+    with single query for each plugin type instead of one for each plugin.
+
+    Instances are cached on the given plugins as instance_cache (None if the
+    concrete row doesn't exist), so CMSPlugin.get_plugin_instance doesn't
+    query again. Returns list of the instances which exist, in given order.
+    """
+    from cms.models import CMSPlugin
+    from cms.plugin_pool import plugin_pool
+    # {model: [pk, ...]}
+    pks = {}
+    for plugin in plugins:
+        if hasattr(plugin, 'instance_cache'):
+            continue
+        model = plugin_pool.get_plugin(plugin.plugin_type).model
+        if model is CMSPlugin or plugin.__class__ is model:
+            plugin.instance_cache = plugin
+        else:
+            pks.setdefault(model, []).append(plugin.pk)
+    instances = {}
+    for model, model_pks in pks.items():
+        for instance in model._default_manager.filter(pk__in=model_pks):
+            instances[instance.pk] = instance
+    downcasted = []
+    for plugin in plugins:
+        if not hasattr(plugin, 'instance_cache'):
+            plugin.instance_cache = instances.get(plugin.pk, None)
+        if plugin.instance_cache is not None:
+            downcasted.append(plugin.instance_cache)
+    return downcasted
@@ -0,0 +1,150 @@
+"""Sitemap.xml of cms pages, generated in pieces.
+
+Pages are read in chunks ordered by pk, each chunk with one query for pages
+and one for their titles, and urls are computed from title paths directly, so
+memory use and the number of queries don't depend on the size of the site.
+Sitemaps with more than MAX_URLS urls are split into sections listed in
+sitemap index. Used by cms.views.sitemap, which joins the pieces of single
+section before responding, and by cms_sitemap command, which streams them to
+files.
+"""
+import zlib
+from xml.sax.saxutils import escape, quoteattr
+from django.conf import settings as django_settings
+from django.core.urlresolvers import reverse
+from cms import settings
+from cms.exceptions import NoHomeFound
+from cms.cache.home import get_home
+from cms.cache.navigation import get_title_url
+from cms.utils.moderator import use_draft, get_page_queryset
+
+# limit of sitemap protocol
+MAX_URLS = 50000
+CHUNK_SIZE = 500
+
+PAGE_FIELDS = ('id', 'parent', 'tree_id')
+TITLE_FIELDS = ('page', 'language', 'slug', 'path', 'has_url_overwrite', 'url')
+
+URLSET_START = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n')
+URLSET_END = '</urlset>\n'
+INDEX_START = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+INDEX_END = '</sitemapindex>\n'
+
+
+def is_multilingual():
+    """Urls have language prefix if MultilingualURLMiddleware is used.
+    """
+    return 'cms.middleware.multilingual.MultilingualURLMiddleware' in django_settings.MIDDLEWARE_CLASSES
+
+def get_sitemap_pages(site_id):
+    """Pages which are served to anonymous visitors.
+    """
+    return get_page_queryset(None).published(site_id).filter(login_required=False)
+
+def get_pages_per_section():
+    """Each page has url for every language, if language prefixes are used.
+    """
+    if is_multilingual():
+        return max(1, MAX_URLS // len(settings.CMS_LANGUAGES))
+    return MAX_URLS
+
+def get_section_count(site_id):
+    pages_per_section = get_pages_per_section()
+    count = get_sitemap_pages(site_id).count()
+    return max(1, (count + pages_per_section - 1) // pages_per_section)
+
+def iter_page_chunks(site_id, section=1):
+    """Yields lists of page values in given section, with their titles under
+    'titles' key.
+    """
+    from cms.models import Title
+    pages = get_sitemap_pages(site_id).order_by('pk')
+    remaining = get_pages_per_section()
+    start = (section - 1) * remaining
+    try:
+        last_pk = pages.values_list('pk', flat=True)[start] - 1
+    except IndexError:
+        return
+    while remaining > 0:
+        chunk = pages.filter(pk__gt=last_pk).values(*PAGE_FIELDS)[:min(CHUNK_SIZE, remaining)]
+        chunk = list(chunk.iterator())
+        if not chunk:
+            return
+        page_titles = {}
+        titles = Title.objects.filter(page__in=[page['id'] for page in chunk])
+        for title in titles.order_by('creation_date').values(*TITLE_FIELDS).iterator():
+            page_titles.setdefault(title['page'], []).append(title)
+        for page in chunk:
+            page['titles'] = page_titles.get(page['id'], [])
+        yield chunk
+        last_pk = chunk[-1]['id']
+        remaining -= len(chunk)
+
+def iter_page_urls(site_id, base_url, section=1):
+    """Yields (url, [(language, url), ...]) for every page in section. With
+    language prefixes there is url for each translation, with its alternates.
+    """
+    try:
+        home = get_home(site_id, use_draft())
+        home_pk, home_tree_id = home.pk, home.tree_id
+    except NoHomeFound:
+        home_pk = home_tree_id = None
+    pages_root = reverse('pages-root')
+    multilingual = is_multilingual()
+    for chunk in iter_page_chunks(site_id, section):
+        for page in chunk:
+            titles = page['titles']
+            if not titles:
+                continue
+            if not multilingual:
+                default = [t for t in titles if t['language'] == settings.CMS_DEFAULT_LANGUAGE]
+                titles = default or titles[-1:]
+            root_id = page['tree_id'] == home_tree_id and home_pk or None
+            urls = []
+            for title in titles:
+                if page['id'] == home_pk:
+                    url = pages_root
+                else:
+                    url = get_title_url(title, page['parent'], root_id, home_pk, pages_root)
+                if multilingual:
+                    url = "/%s%s" % (title['language'], url)
+                urls.append((title['language'], base_url + url))
+            for language, url in urls:
+                if len(urls) > 1:
+                    yield url, urls
+                else:
+                    yield url, []
+
+def iter_urlset(urls):
+    """Yields sitemap xml for (url, alternates) pairs, in pieces.
+    """
+    yield URLSET_START
+    for url, alternates in urls:
+        parts = ['<url><loc>%s</loc>' % escape(url)]
+        for language, alternate in alternates:
+            parts.append('<xhtml:link rel="alternate" hreflang=%s href=%s/>' % (
+                quoteattr(language), quoteattr(alternate)))
+        parts.append('</url>\n')
+        yield "".join(parts).encode('utf-8')
+    yield URLSET_END
+
+def iter_sitemap_index(locations):
+    """Yields sitemap index xml for given sitemap urls.
+    """
+    yield INDEX_START
+    for location in locations:
+        yield ('<sitemap><loc>%s</loc></sitemap>\n' % escape(location)).encode('utf-8')
+    yield INDEX_END
+
+def gzip_stream(pieces):
+    """Compresses pieces of content on the fly, yields gzip data.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for piece in pieces:
+        data = compressor.compress(piece)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,74 +1,92 @@
-from django.http import Http404, HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.core.urlresolvers import reverse
 from cms import settings
-from cms.utils import auto_render, get_template_from_request, get_language_from_request
-from django.db.models.query_utils import Q
+from cms.utils import auto_render, get_template_from_request
+from cms.exceptions import NoHomeFound
+from cms.utils.cmscontext import get_cms_context
 from cms.appresolver import applications_page_check
-from django.contrib.sites.models import Site
-from cms.utils.moderator import get_page_queryset
+from cms.cache.routing import get_page_ids, get_page_languages, get_page_slug
+from cms.cache.language_urls import get_language_url
+from cms.cache.notfound import is_missing, set_missing
+from cms.cache.page import cache_page_response, conditional_page_response,\
+    is_conditional_request, get_not_modified_response
+from cms.utils.sitemap import get_section_count, iter_page_urls, iter_urlset,\
+    iter_sitemap_index, gzip_stream
 
-def get_current_page(path, lang, queryset, home_slug, home_tree_id):
+def get_current_page(path, lang, queryset, home_slug, home_tree_id, site_id=settings.SITE_ID, draft=False):
     """Helper for getting current page from path depending on language
     
+    Candidates are looked up in routing index (cms.cache.routing), so just
+    the page itself gets fetched from db.
+    
     returns: (Page, None) or (None, path_to_alternative language)
     """
+    page_ids = get_page_ids(site_id, draft, path, lang, home_slug, home_tree_id)
+    if not page_ids:
+        return None, None
     try:
-        if home_slug:
-            queryset = queryset.exclude(Q(title_set__path=home_slug)&Q(tree_id=home_tree_id))
-            home_slug += "/"
-            title_q = Q(title_set__path=path)|(Q(title_set__path=home_slug + path)&Q(tree_id=home_tree_id))
-            
-        else:
-            title_q = Q(title_set__slug=path)
-        if settings.CMS_FLAT_URLS:
-            return queryset.filter(title_q & Q(title_set__language=lang)).distinct().select_related()[0], None
-        else:
-            page = queryset.filter(title_q).distinct().select_related()[0]
-            if page:
-                langs = page.get_languages() 
-                if lang in langs:
-                    return page, None
-                else:
-                    path = None
-                    for alt_lang in settings.LANGUAGES:
-                        if alt_lang[0] in langs:
-                            path = '/%s%s' % (alt_lang[0], page.get_absolute_url(language=lang, fallback=True))
-                    return None, path
+        page = queryset.filter(pk__in=page_ids).select_related()[0]
     except IndexError:
         return None, None
+    if settings.CMS_FLAT_URLS:
+        return page, None
+    page.languages_cache = get_page_languages(site_id, draft, page.pk)
+    langs = page.get_languages() 
+    if lang in langs:
+        return page, None
+    else:
+        path = None
+        for alt_lang in settings.LANGUAGES:
+            if alt_lang[0] in langs:
+                path = '/%s%s' % (alt_lang[0], get_language_url(page, lang))
+        return None, path
 
 def details(request, page_id=None, slug=None, template_name=settings.CMS_TEMPLATES[0][0], no404=False):
     # get the right model
-    page_queryset = get_page_queryset(request)
+    cms_context = get_cms_context(request)
+    page_queryset = cms_context.page_queryset
     
-    lang = get_language_from_request(request)
-    site = Site.objects.get_current()
+    lang = cms_context.language
+    site = cms_context.site
     if 'preview' in request.GET.keys():
         pages = page_queryset.all()
     else:
         pages = page_queryset.published()
     
-    root_pages = pages.all_root().order_by("tree_id")
+    # paths which weren't found recently don't need any db lookup
+    not_found_cache = slug and not page_id and not no404 and not 'preview' in request.GET
+    if not_found_cache and is_missing(site.pk, cms_context.draft, lang, slug):
+        raise Http404('CMS: Page not found for "%s"' % slug)
+    
+    # home page comes from the home registry, previews may show unpublished
+    # root pages, so they look it up in db
+    home = None
+    if not 'preview' in request.GET:
+        try:
+            home = cms_context.get_home()
+        except NoHomeFound:
+            pass
+    if home is None:
+        root_pages = list(pages.all_root().order_by("tree_id")[:1])
+        if root_pages:
+            home = root_pages[0]
     current_page, response = None, None
-    if root_pages:
+    if home:
         if page_id:
             current_page = get_object_or_404(pages, pk=page_id)
         elif slug != None:
             if slug == "":
-                current_page = root_pages[0]
+                current_page = pages.all_root().order_by("tree_id")[0]
             else:
                 if slug.startswith(reverse('pages-root')):
                     path = slug.replace(reverse('pages-root'), '', 1)
                 else:
                     path = slug
-                if root_pages:
-                    home_tree_id = root_pages[0].tree_id
-                    home_slug = root_pages[0].get_slug(language=lang)
-                else:
-                    home_slug = ""
-                    home_tree_id = None
-                current_page, alternative = get_current_page(path, lang, pages, home_slug, home_tree_id)
+                # slug is taken from routing index, not from home titles
+                home_slug = get_page_slug(site.pk, cms_context.draft, home.pk, lang) or ""
+                current_page, alternative = get_current_page(path, lang, pages, 
+                    home_slug, home.tree_id, site.pk, cms_context.draft)
                 if settings.CMS_APPLICATIONS_URLS:
                     # check if it should'nt point to some application, if yes,
                     # change current page if required
@@ -79,6 +97,8 @@ def details(request, page_id=None, slug=None, template_name=settings.CMS_TEMPLAT
                     if no404:# used for placeholder finder
                         current_page = None
                     else:
+                        if not_found_cache:
+                            set_missing(site.pk, cms_context.draft, lang, slug)
                         raise Http404('CMS: Page not found for "%s"' % slug)
         else:
             current_page = applications_page_check(request)
@@ -92,7 +112,39 @@ def details(request, page_id=None, slug=None, template_name=settings.CMS_TEMPLAT
         request._current_page_cache = current_page
         if current_page.get_redirect(language=lang):
             return HttpResponseRedirect(current_page.get_redirect(language=lang))
+        # no404 is used when only looking for page from other views
+        if not no404 and is_conditional_request(request):
+            response = get_not_modified_response(request, current_page, lang)
+            if response:
+                return response
     else:
         has_change_permissions = False
     return template_name, locals()
-details = auto_render(details)
+details = cache_page_response(conditional_page_response(auto_render(details)))
+
+def sitemap(request, section=None, compress=False):
+    """Serves sitemap.xml of current site. Sites with too many pages get
+    sitemap index instead, sections are served by the same view with section
+    number - e.g. sitemap-2.xml for sitemap.xml.
+    
+    Content is built before the response is returned, so the queries run
+    inside the request and errors don't end up in truncated xml. Sections
+    are limited to MAX_URLS urls, only cms_sitemap command streams them.
+    """
+    site = get_cms_context(request).site
+    base_url = "%s://%s" % (request.is_secure() and "https" or "http", site.domain)
+    count = get_section_count(site.pk)
+    if section is None and count > 1:
+        name, extension = request.path.split(".", 1)
+        locations = ["%s%s-%d.%s" % (base_url, name, number, extension)
+            for number in range(1, count + 1)]
+        content = iter_sitemap_index(locations)
+    else:
+        section = int(section or 1)
+        if section > count:
+            raise Http404("CMS: No sitemap section %d" % section)
+        content = iter_urlset(iter_page_urls(site.pk, base_url, section))
+    content = "".join(content)
+    if compress:
+        return HttpResponse("".join(gzip_stream([content])), mimetype="application/x-gzip")
+    return HttpResponse(content, mimetype="application/xml")
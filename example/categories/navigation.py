@@ -1,18 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from cms.extender_pool import cached_extender
 from categories.models import Category
 
+@cached_extender(60 * 60, ((post_save, Category), (post_delete, Category)))
 def get_nodes(request):
     cats = list(Category.objects.all())
     res = []
-    all_cats = cats[:]
-    childs = []
+    childs = {}
     for cat in cats:
+        cat.childrens = childs.setdefault(cat.pk, [])
         if cat.parent_id:
-            childs.append(cat)
+            childs.setdefault(cat.parent_id, []).append(cat)
         else:
             res.append(cat)
-    for cat in all_cats:
-        cat.childrens = []
-        for child in childs:
-            if child.parent_id == cat.pk:
-                cat.childrens.append(child)
-    return res
\ No newline at end of file
+    return res